@@ -2,14 +2,86 @@ import sys
 import serial
 import serial.tools.list_ports
 import csv
+import os
+import queue
+import selectors
+import threading
 import time
+from datetime import datetime
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QLabel,
     QVBoxLayout, QWidget, QHBoxLayout, QComboBox, QTextEdit,
     QCheckBox, QComboBox
 )
 import pyqtgraph as pg
-from PyQt5.QtCore import QTimer, QDateTime
+from PyQt5.QtCore import QTimer, QThread, QEvent
+
+
+def tick_timestamps():
+    """Wall-clock stamps shared by every line drained in one tick: ('HH:MM:SS.mmm', 'YYYY-MM-DD HH:MM:SS.mmm')."""
+    iso = datetime.now().isoformat(sep=' ', timespec='milliseconds')
+    return iso[11:], iso
+
+
+class SerialReader(QThread):
+    """Reads the serial port on its own thread and hands raw chunks to the GUI through a queue."""
+
+    BUF_SIZE = 4096
+    BUF_COUNT = 8
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.serial = ser
+        self.queue = queue.SimpleQueue()
+        self.error = None
+        self._stop = threading.Event()
+        # POSIX: wait on the fd with a selector registered once (epoll on Linux) and
+        # scatter-read straight from it into a fixed pool of buffers
+        self._bufs = None
+        self._sel = None
+        if os.name == "posix":
+            self._bufs = [bytearray(self.BUF_SIZE) for _ in range(self.BUF_COUNT)]
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(ser.fileno(), selectors.EVENT_READ)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                if self._bufs:
+                    data = self._read_direct()
+                else:
+                    # Block (up to the port timeout) for the first byte, then take whatever else is waiting
+                    data = self.serial.read(self.serial.in_waiting or 1)
+            except Exception as e:
+                self.error = e
+                break
+            if data:
+                self.queue.put(data)
+        if self._sel:
+            self._sel.close()
+
+    def _read_direct(self):
+        """Sleep until the fd is readable, then fill up to BUF_COUNT x BUF_SIZE bytes with one readv() call."""
+        if not self._sel.select(0.05):
+            return b''
+        fd = self.serial.fileno()
+        try:
+            n = os.readv(fd, self._bufs)
+        except BlockingIOError:
+            return b''
+        if n == 0:
+            raise serial.SerialException("device reports readiness to read but returned no data")
+        full, rem = divmod(n, self.BUF_SIZE)
+        parts = self._bufs[:full]
+        if rem:
+            parts.append(memoryview(self._bufs[full])[:rem])
+        return b''.join(parts)
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
+
 
 class SerialPlotApp(QMainWindow):
     def __init__(self):
@@ -18,19 +90,27 @@ class SerialPlotApp(QMainWindow):
         self.setGeometry(100, 100, 900, 700)
 
         self.serial = None
-        self.data = []
+        self.reader = None
+        self._rx_tail = bytearray()  # partial line carried over between ticks
         self.csv_writer = None
         self.csv_file = None
         self.max_data_points = 250 # default 5 sec * 50Hz
+        # Ring buffer of samples: y values, _head counts every sample ever pushed
+        self._y = np.empty(self.max_data_points, dtype=np.float32)
+        self._head = 0
         self.monitor_lines = []  # stores (timestamp, line)
         self.max_monitor_lines = 100
+        self._monitor_stale = False  # lines arrived while hidden; redraw the monitor on restore
 
         # Plotting widget
         self.plot_widget = pg.PlotWidget()
         self.plot_widget.setYRange(0, 4096)
+        # One curve reused every tick (values are always finite floats)
+        self.plot_curve = self.plot_widget.plot([], skipFiniteCheck=True)
 
         # Serial port selector
         self.port_selector = QComboBox()
+        self._last_ports = ()
 
         # Buttons and labels
         self.start_button = QPushButton("Start")
@@ -52,12 +132,14 @@ class SerialPlotApp(QMainWindow):
         # Add checkbox for timestamp toggle in serial monitor
         self.timestamp_checkbox = QCheckBox("Show Timestamps in Monitor")
         self.timestamp_checkbox.setChecked(True)
-        self.timestamp_checkbox.stateChanged.connect(self.refresh_monitor_display)
+        self.timestamp_checkbox.stateChanged.connect(self._full_rebuild_monitor)
 
         # Raw serial monitor
         self.serial_monitor = QTextEdit()
         self.serial_monitor.setReadOnly(True)
         self.serial_monitor.setFixedHeight(150)
+        # Qt drops the oldest blocks itself, so new lines can simply be appended
+        self.serial_monitor.document().setMaximumBlockCount(self.max_monitor_lines)
 
         # Layout
         top_layout = QHBoxLayout()
@@ -100,8 +182,11 @@ class SerialPlotApp(QMainWindow):
         self.refresh_ports()
 
     def refresh_ports(self):
+        ports = tuple(port.device for port in serial.tools.list_ports.comports())
+        if ports == self._last_ports:
+            return  # nothing changed; skip the combo box rebuild
+        self._last_ports = ports
         current_port = self.port_selector.currentText()
-        ports = [port.device for port in serial.tools.list_ports.comports()]
         self.port_selector.blockSignals(True)
         self.port_selector.clear()
         self.port_selector.addItems(ports)
@@ -114,8 +199,12 @@ class SerialPlotApp(QMainWindow):
         if self.start_button.isChecked():
             selected_port = self.port_selector.currentText()
             try:
-                self.serial = serial.Serial(selected_port, 9600, timeout=1)
-                self.data = []
+                # Short timeout so the reader thread notices a stop request quickly
+                self.serial = serial.Serial(selected_port, 9600, timeout=0.05)
+                self._rx_tail.clear()
+                self.reader = SerialReader(self.serial)
+                self.reader.start()
+                self._head = 0
                 if self.save_csv_checkbox.isChecked():
                     # Prepare CSV log file
                     timestamp = time.strftime("%Y%m%d-%H%M%S")
@@ -136,6 +225,9 @@ class SerialPlotApp(QMainWindow):
 
     def stop_plotting(self):
         self.plot_timer.stop()
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         if self.serial:
             self.serial.close()
             self.serial = None
@@ -146,43 +238,61 @@ class SerialPlotApp(QMainWindow):
         self.start_button.setText("Start")
 
     def update_plot(self):
-        if self.serial and self.serial.in_waiting:
+        if not self.reader:
+            return
+        if self.reader.error:
+            self.label_status.setText(f"Status: Serial error - {self.reader.error}")
+            return
+
+        # Collect everything the reader thread received and split into complete lines
+        if self.reader.queue.empty():
+            return
+        while not self.reader.queue.empty():
+            self._rx_tail += self.reader.queue.get_nowait()
+        *lines, self._rx_tail = self._rx_tail.split(b'\n')
+        self._rx_tail = bytearray(self._rx_tail)
+
+        clock_str, iso_str = tick_timestamps()
+        new_monitor_lines = []
+        values = []
+        value = None
+        for raw in lines:
+            line = raw.decode('ascii', 'ignore').strip()
+            if not line:
+                continue
+
+            self.monitor_lines.append((clock_str, line))
+            new_monitor_lines.append((clock_str, line))
+
             try:
-                line = self.serial.readline().decode(errors='ignore').strip()
-                if line:
-
-                    now = QDateTime.currentDateTime().toString("HH:mm:ss.zzz")
-                    self.monitor_lines.append((now, line))
-                    if len(self.monitor_lines) > self.max_monitor_lines:
-                        self.monitor_lines = self.monitor_lines[-self.max_monitor_lines:]
-
-                    self.refresh_monitor_display()
-
-                    # Keep Only Latest 100 Lines in Serial Monitor (optional)
-                    if self.serial_monitor.document().blockCount() > 100:
-                        cursor = self.serial_monitor.textCursor()
-                        cursor.movePosition(cursor.Start)
-                        cursor.select(cursor.LineUnderCursor)
-                        cursor.removeSelectedText()
-                        cursor.deleteChar()
-
-                    value = float(line)
-                    now = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-                    self.data.append((now, value))
-
-                    if len(self.data) > self.max_data_points:
-                        self.data = self.data[-self.max_data_points:]
-
-                    values_only = [v for (_, v) in self.data]
-                    self.plot_widget.plot(values_only, clear=True)
-                    self.label_value.setText(f"Value: {value:.2f}")
-
-                    # Log to CSV with timestamp
-                    #now = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-                    if self.csv_writer:
-                        self.csv_writer.writerow([now, value])
+                value = float(line)
             except ValueError:
                 self.label_status.setText("Status: Invalid data")
+                continue
+            values.append(value)
+
+            # Log to CSV with timestamp
+            if self.csv_writer:
+                self.csv_writer.writerow([iso_str, value])
+
+        if len(self.monitor_lines) > self.max_monitor_lines:
+            self.monitor_lines = self.monitor_lines[-self.max_monitor_lines:]
+        if values:
+            self.push_samples(values)
+
+        # Nobody is looking: data is logged above, skip all drawing until the window comes back
+        if self.isMinimized() or not self.isVisible():
+            if new_monitor_lines:
+                self._monitor_stale = True
+            return
+
+        # Append only the newly received lines to the monitor (one call per tick)
+        if new_monitor_lines:
+            self.append_monitor_lines(new_monitor_lines[-self.max_monitor_lines:])
+
+        if value is not None:
+            self.plot_curve.setData(self.ring_view(self._y))
+            self.label_value.setText(f"Value: {value:.2f}")
 
     def update_buffer_size(self):
         duration_map = {
@@ -196,16 +306,64 @@ class SerialPlotApp(QMainWindow):
         selected = self.duration_selector.currentText()
         seconds = duration_map.get(selected, 60)
         self.max_data_points = seconds * 50  # 50 Hz
-
-    def refresh_monitor_display(self):
+        self.resize_ring(self.max_data_points)
+
+    def push_samples(self, values):
+        """Write values into the ring buffer, overwriting the oldest once it is full."""
+        cap = self._y.shape[0]
+        n = len(values)
+        if n > cap:
+            self._head += n - cap
+            values = values[-cap:]
+            n = cap
+        i = self._head % cap
+        first = min(n, cap - i)
+        self._y[i:i + first] = values[:first]
+        self._y[:n - first] = values[first:]
+        self._head += n
+
+    def ring_view(self, buf):
+        """Samples of buf oldest-first: a view until the ring wraps, then one concatenated copy."""
+        cap = buf.shape[0]
+        if self._head <= cap:
+            return buf[:self._head]
+        i = self._head % cap
+        return np.concatenate((buf[i:], buf[:i]))
+
+    def resize_ring(self, capacity):
+        """Reallocate the ring buffer for a new capacity, keeping the most recent samples."""
+        y = self.ring_view(self._y)[-capacity:]
+        self._y = np.empty(capacity, dtype=np.float32)
+        self._y[:len(y)] = y
+        self._head = len(y)
+
+    def format_monitor_lines(self, entries):
+        if self.timestamp_checkbox.isChecked():
+            return "\n".join(f"[{timestamp}] {line}" for timestamp, line in entries)
+        return "\n".join(line for _, line in entries)
+
+    def append_monitor_lines(self, entries):
+        self.serial_monitor.append(self.format_monitor_lines(entries))
+
+    def _full_rebuild_monitor(self):
+        """Redraw the whole monitor from monitor_lines (only needed when the timestamp toggle changes)."""
+        self._monitor_stale = False
         self.serial_monitor.clear()
-        show_time = self.timestamp_checkbox.isChecked()
-        for timestamp, line in self.monitor_lines:
-            if show_time:
-                display = f"[{timestamp}] {line}"
-            else:
-                display = line
-            self.serial_monitor.append(display)
+        if self.monitor_lines:
+            self.append_monitor_lines(self.monitor_lines)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            # Keep draining the port while minimized, just far less often
+            self.plot_timer.setInterval(200 if self.isMinimized() else 1000 // 50)
+            if not self.isMinimized() and self._monitor_stale:
+                self._full_rebuild_monitor()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._monitor_stale:
+            self._full_rebuild_monitor()
 
     def closeEvent(self, event):
         self.stop_plotting()
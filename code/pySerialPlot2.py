@@ -2,20 +2,226 @@
 import sys
 import serial
 import serial.tools.list_ports
-import csv
+import operator
+import os
+import queue
+import re
+import selectors
+import threading
 import time
-from collections import deque
-
+from datetime import datetime
+from collections import deque, namedtuple
+
+import numpy as np
+try:
+    from numba import njit   # optional: compiles the block parser below
+except ImportError:
+    njit = None
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QLabel,
     QVBoxLayout, QWidget, QHBoxLayout, QComboBox, QTextEdit,
     QCheckBox, QSpinBox
 )
-from PyQt5.QtCore import QTimer, QDateTime
+from PyQt5.QtCore import QTimer, QThread, QEvent
 import pyqtgraph as pg
 
 
 CSV_HEADER_FIELDS = ["t_us", "raw", "avg", "v_adc", "v_sensor"]
+# One parsed CSV row; field order matches CSV_HEADER_FIELDS so a Sample is also a CSV row
+Sample = namedtuple("Sample", CSV_HEADER_FIELDS)
+# iso_time + CSV_HEADER_FIELDS, preformatted so a tick's rows become one bytes write
+_CSV_ROW_FMT = "%s,%d,%d,%.6f,%.6f,%.6f\n"
+# CSV_HEADER_FIELDS only; prefixed with the tick's iso_time and repeated N times, it formats a whole block in one % call
+_CSV_BLOCK_ROW_FMT = "%d,%d,%.6f,%.6f,%.6f\n"
+# One complete 't_us,raw,avg,v_adc,v_sensor' row (extra trailing columns are ignored)
+_LINE_RE = re.compile(rb'^(\d+),([-\d.eE]+),([-\d.eE]+),([-\d.eE]+),([-\d.eE]+)(?:,[^\r\n]*)?\r?$', re.MULTILINE)
+
+
+# Exact powers of ten: a mantissa below 2**53 scaled by one of these in a single * or / is
+# correctly rounded (Clinger's fast path), i.e. the same double float() returns
+_POW10 = np.array([1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+                   1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22])
+_MANT_EXACT = 9007199254740992.0   # 2**53
+# _parse_rows result: a token is outside the fast path, let float() parse the block
+_PARSE_INEXACT = -2
+
+
+def _parse_rows(buf, out):
+    """Scan newline-separated 't_us,raw,avg,v_adc,v_sensor' rows from a uint8 buffer into out (N, 5).
+    Extra trailing columns are ignored. Returns the number of rows written, -1 as soon as a
+    non-blank line does not fit the format, or _PARSE_INEXACT when a number has too many
+    digits (or too large an exponent) to be converted exactly here.
+    """
+    n = buf.shape[0]
+    ncols = out.shape[1]
+    row = 0
+    i = 0
+    while i < n:
+        c = buf[i]
+        if c == 10 or c == 13 or c == 32:   # blank line / CR / space
+            i += 1
+            continue
+        if row >= out.shape[0]:
+            return -1
+        col = 0
+        while True:
+            neg = False
+            if i < n and (buf[i] == 45 or buf[i] == 43):   # '-' / '+'
+                neg = buf[i] == 45
+                i += 1
+            mant = 0.0
+            digits = 0
+            scale = 0
+            while i < n and 48 <= buf[i] <= 57:
+                mant = mant * 10.0 + (buf[i] - 48)
+                digits += 1
+                i += 1
+            if i < n and buf[i] == 46:   # '.'
+                i += 1
+                while i < n and 48 <= buf[i] <= 57:
+                    mant = mant * 10.0 + (buf[i] - 48)
+                    digits += 1
+                    scale -= 1
+                    i += 1
+            if digits == 0:
+                return -1
+            if i < n and (buf[i] == 101 or buf[i] == 69):   # 'e' / 'E'
+                i += 1
+                eneg = False
+                if i < n and (buf[i] == 45 or buf[i] == 43):
+                    eneg = buf[i] == 45
+                    i += 1
+                e = 0
+                edigits = 0
+                while i < n and 48 <= buf[i] <= 57:
+                    e = e * 10 + (buf[i] - 48)
+                    edigits += 1
+                    i += 1
+                if edigits == 0:
+                    return -1
+                scale += -e if eneg else e
+            if mant >= _MANT_EXACT or scale < -22 or scale > 22:
+                return _PARSE_INEXACT
+            if scale < 0:
+                val = mant / _POW10[-scale]
+            else:
+                val = mant * _POW10[scale]
+            out[row, col] = -val if neg else val
+            col += 1
+            if col == ncols:
+                break
+            if i >= n or buf[i] != 44:   # ','
+                return -1
+            i += 1
+        if i < n and buf[i] == 44:   # skip extra columns
+            while i < n and buf[i] != 10:
+                i += 1
+        while i < n and (buf[i] == 13 or buf[i] == 32):
+            i += 1
+        if i < n and buf[i] != 10:
+            return -1
+        row += 1
+    return row
+
+
+# Native block parser when numba is installed; otherwise parse_block uses _LINE_RE.
+# No on-disk cache in a frozen (pyinstaller) build: its directory is not writable.
+_parse_rows_jit = njit(cache=not getattr(sys, "frozen", False))(_parse_rows) if njit is not None else None
+
+
+def warm_up_parser():
+    """Compile _parse_rows now (at startup) instead of on the GUI thread at the first burst."""
+    if _parse_rows_jit is not None:
+        _parse_rows_jit(np.frombuffer(b"0,0,0.5,0,0\n", dtype=np.uint8), np.empty((1, 5), dtype=np.float64))
+
+
+def minmax_decimate(xs, ys, buckets):
+    """Reduce a long trace to the min and max sample of each bucket (in time order) so peaks survive.
+    Returns at most ~2*buckets points; the trailing partial bucket is kept as-is.
+    """
+    n = len(ys)
+    stride = n // max(1, buckets)
+    if stride < 2:
+        return xs, ys
+    m = n - n % stride
+    yb = ys[:m].reshape(-1, stride)
+    xb = xs[:m].reshape(-1, stride)
+    imin = yb.argmin(axis=1)
+    imax = yb.argmax(axis=1)
+    idx = np.empty((len(yb), 2), dtype=np.intp)
+    idx[:, 0] = np.minimum(imin, imax)
+    idx[:, 1] = np.maximum(imin, imax)
+    out_x = np.take_along_axis(xb, idx, axis=1).ravel()
+    out_y = np.take_along_axis(yb, idx, axis=1).ravel()
+    if m < n:
+        out_x = np.concatenate((out_x, xs[m:]))
+        out_y = np.concatenate((out_y, ys[m:]))
+    return out_x, out_y
+
+
+def tick_timestamps():
+    """Wall-clock stamps shared by every line drained in one tick: ('HH:MM:SS.mmm', 'YYYY-MM-DD HH:MM:SS.mmm')."""
+    iso = datetime.now().isoformat(sep=' ', timespec='milliseconds')
+    return iso[11:], iso
+
+
+class SerialReader(QThread):
+    """Reads the serial port on its own thread and hands raw chunks to the GUI through a queue."""
+
+    BUF_SIZE = 4096
+    BUF_COUNT = 8
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.serial = ser
+        self.queue = queue.SimpleQueue()
+        self.error = None
+        self._stop = threading.Event()
+        # POSIX: wait on the fd with a selector registered once (epoll on Linux) and
+        # scatter-read straight from it into a fixed pool of buffers
+        self._bufs = None
+        self._sel = None
+        if os.name == "posix":
+            self._bufs = [bytearray(self.BUF_SIZE) for _ in range(self.BUF_COUNT)]
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(ser.fileno(), selectors.EVENT_READ)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                if self._bufs:
+                    data = self._read_direct()
+                else:
+                    # Block (up to the port timeout) for the first byte, then take whatever else is waiting
+                    data = self.serial.read(self.serial.in_waiting or 1)
+            except Exception as e:
+                self.error = e
+                break
+            if data:
+                self.queue.put(data)
+        if self._sel:
+            self._sel.close()
+
+    def _read_direct(self):
+        """Sleep until the fd is readable, then fill up to BUF_COUNT x BUF_SIZE bytes with one readv() call."""
+        if not self._sel.select(0.05):
+            return b''
+        fd = self.serial.fileno()
+        try:
+            n = os.readv(fd, self._bufs)
+        except BlockingIOError:
+            return b''
+        if n == 0:
+            raise serial.SerialException("device reports readiness to read but returned no data")
+        full, rem = divmod(n, self.BUF_SIZE)
+        parts = self._bufs[:full]
+        if rem:
+            parts.append(memoryview(self._bufs[full])[:rem])
+        return b''.join(parts)
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
 
 class SerialPlotApp(QMainWindow):
     def __init__(self):
@@ -25,18 +231,34 @@ class SerialPlotApp(QMainWindow):
 
         # Runtime state
         self.serial = None
-        self.csv_writer = None
-        self.csv_file = None
-        self.monitor_lines = []                # [(timestamp_str, line), ...]
+        self.reader = None                     # SerialReader thread feeding update_plot
+        self.csv_file = None                   # binary file; rows are preformatted bytes
+        self.csv_flush_every = 50              # flush CSV every N ticks (~1 s at 50 Hz)
+        self._csv_ticks = 0
+        self._rx_tail = bytearray()            # partial line carried over between ticks
+        self._tick_clock, self._tick_iso = tick_timestamps()  # formatted once per update_plot tick
         self.max_monitor_lines = 300
+        self.monitor_lines = deque(maxlen=self.max_monitor_lines)  # [(timestamp_str, line), ...]
+        self._monitor_stale = False            # lines arrived while hidden; redraw the monitor on restore
 
         # Data buffers (time in seconds from first sample t0; y-values depend on selection)
-        self.t0_us = None                      # first t_us seen (for X axis zero)
-        self.x_data = []                       # seconds
-        self.y_data = []                       # selected field values
-        self.last_fields = None                # last parsed field dict (for labels/logging)
         self.buffer_seconds = 10               # default buffer window
         self.max_points_cap = 2_000_000        # hard cap to avoid runaway memory
+        self.t0_us = None                      # first t_us seen (for X axis zero)
+        # Preallocated ring buffer; _head/_tail are absolute sample indices (slot = index % cap)
+        self._xbuf = np.empty(self.max_points_cap, np.float64)  # seconds
+        self._ybuf = np.empty(self.max_points_cap, np.float32)  # selected field values
+        self._head = 0                         # oldest sample kept
+        self._tail = 0                         # one past the newest sample
+        self._window_cache = None              # contiguous (x, y) for plotting, rebuilt on change
+        self._dirty = False                    # new samples since the last setData
+        self.range_update_ms = 500             # view range is set by hand at this interval
+        self._last_range_update = 0.0
+        self.last_fields = None                # last parsed Sample (for labels/logging)
+        # Selected Y field, cached on selector change so the read loop never asks Qt
+        self._field_key = "v_sensor"
+        self._field_idx = CSV_HEADER_FIELDS.index(self._field_key)
+        self._parsed_getter = operator.attrgetter(self._field_key)
         self.default_sps_guess = 1000          # used to size buffers before we can estimate
 
         # --- Widgets ---
@@ -46,12 +268,17 @@ class SerialPlotApp(QMainWindow):
         self.plot_widget.showGrid(x=True, y=True, alpha=0.25)
         self.plot_widget.setLabel('bottom', 'Time', units='s')
         self.plot_widget.setLabel('left', 'Value')
-        self.plot_curve = self.plot_widget.plot([], [], pen=pg.mkPen(width=2))
+        self.plot_curve = self.plot_widget.plot([], [], pen=pg.mkPen(width=2),
+                                                skipFiniteCheck=True, connect='all')
         # Optimize paint/update
         self.plot_widget.setClipToView(True)
+        self.plot_curve.setDownsampling(auto=True, method='peak')
+        # Per-frame auto-range walks every point; ranges are set in update_view_range instead
+        self.plot_widget.disableAutoRange()
 
         # Serial port selector
         self.port_selector = QComboBox()
+        self._last_ports = ()
         # Baud selector (largely ignored for USB CDC, but present for flexibility)
         self.baud_selector = QComboBox()
         self.baud_selector.addItems(["9600", "115200", "230400", "460800", "921600", "1000000", "2000000"])
@@ -89,12 +316,14 @@ class SerialPlotApp(QMainWindow):
         # Timestamp toggle for monitor
         self.timestamp_checkbox = QCheckBox("Show Timestamps in Monitor")
         self.timestamp_checkbox.setChecked(True)
-        self.timestamp_checkbox.stateChanged.connect(self.refresh_monitor_display)
+        self.timestamp_checkbox.stateChanged.connect(self._full_rebuild_monitor)
 
         # Raw serial monitor
         self.serial_monitor = QTextEdit()
         self.serial_monitor.setReadOnly(True)
         self.serial_monitor.setFixedHeight(180)
+        # Qt drops the oldest blocks itself, so new lines can simply be appended
+        self.serial_monitor.document().setMaximumBlockCount(self.max_monitor_lines)
 
         # Layout
         top_layout = QHBoxLayout()
@@ -145,8 +374,11 @@ class SerialPlotApp(QMainWindow):
     # ---------- UI callbacks ----------
 
     def refresh_ports(self):
+        ports = tuple(port.device for port in serial.tools.list_ports.comports())
+        if ports == self._last_ports:
+            return  # nothing changed; skip the combo box rebuild
+        self._last_ports = ports
         current_port = self.port_selector.currentText()
-        ports = [port.device for port in serial.tools.list_ports.comports()]
         self.port_selector.blockSignals(True)
         self.port_selector.clear()
         self.port_selector.addItems(ports)
@@ -171,13 +403,16 @@ class SerialPlotApp(QMainWindow):
                 # Open serial; on USB CDC the baud is typically ignored by the device.
                 self.serial = serial.Serial(selected_port, baudrate=baud, timeout=0.05)
                 self.reset_session_state()
+                self.reader = SerialReader(self.serial)
+                self.reader.start()
 
                 # Prepare CSV log file if requested
                 if self.save_csv_checkbox.isChecked():
                     timestamp = time.strftime("%Y%m%d-%H%M%S")
-                    self.csv_file = open(f"serial_log_{timestamp}.csv", 'w', newline='')
-                    self.csv_writer = csv.writer(self.csv_file)
-                    self.csv_writer.writerow(["iso_time"] + CSV_HEADER_FIELDS)
+                    # Large block buffer; rows are written in batches and flushed periodically
+                    self.csv_file = open(f"serial_log_{timestamp}.csv", 'wb', buffering=1 << 20)
+                    self.csv_file.write(",".join(["iso_time"] + CSV_HEADER_FIELDS).encode('ascii') + b"\n")
+                    self._csv_ticks = 0
 
                 self.plot_timer.start(20)  # UI refresh ~50 Hz
                 self.label_status.setText("Status: Running")
@@ -190,6 +425,9 @@ class SerialPlotApp(QMainWindow):
 
     def stop_plotting(self):
         self.plot_timer.stop()
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         if self.serial:
             try:
                 self.serial.close()
@@ -202,7 +440,6 @@ class SerialPlotApp(QMainWindow):
             except Exception:
                 pass
             self.csv_file = None
-            self.csv_writer = None
         self.label_status.setText("Status: Stopped")
         self.start_button.setText("Start")
 
@@ -220,14 +457,18 @@ class SerialPlotApp(QMainWindow):
         self.buffer_seconds = seconds
 
     def on_field_changed(self):
+        self._field_key = self.field_selector.currentText()
+        self._field_idx = CSV_HEADER_FIELDS.index(self._field_key)
+        self._parsed_getter = operator.attrgetter(self._field_key)
         self.update_y_axis()
 
     def update_y_axis(self):
         field = self.field_selector.currentText()
         if self.auto_y_checkbox.isChecked():
-            self.plot_widget.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
+            # Fitted to the data by update_view_range on the next redraw
+            self._last_range_update = 0.0
+            self._dirty = True
         else:
-            self.plot_widget.enableAutoRange(axis=pg.ViewBox.YAxis, enable=False)
             if field in ("raw", "avg"):
                 self.plot_widget.setYRange(0, 4096)
             elif field in ("v_adc",):
@@ -238,17 +479,19 @@ class SerialPlotApp(QMainWindow):
     # ---------- Session / parsing ----------
 
     def reset_session_state(self):
+        self._rx_tail.clear()
         self.monitor_lines.clear()
-        self.x_data.clear()
-        self.y_data.clear()
+        self._head = self._tail = 0
+        self._window_cache = None
+        self._dirty = False
         self.t0_us = None
         self.last_fields = None
-        self.refresh_monitor_display()
+        self._full_rebuild_monitor()
 
     def parse_line(self, line):
         """Parse one incoming line.
         Returns:
-            dict with keys among CSV_HEADER_FIELDS, or {'val': float} for single-value lines,
+            Sample for CSV rows, float for single-value lines,
             or None for headers/invalid lines.
         """
         s = line.strip()
@@ -266,159 +509,283 @@ class SerialPlotApp(QMainWindow):
                 avg = float(parts[2])
                 v_adc = float(parts[3])
                 v_sensor = float(parts[4])
-                return {"t_us": t_us, "raw": raw, "avg": avg, "v_adc": v_adc, "v_sensor": v_sensor}
+                return Sample(t_us, raw, avg, v_adc, v_sensor)
             except Exception:
                 pass
 
         # Fallback: single numeric value
         try:
-            val = float(s)
-            return {"val": val}
+            return float(s)
         except Exception:
             return None
 
+    def parse_block(self, lines):
+        """Parse a whole tick of 't_us,raw,avg,v_adc,v_sensor' rows in one native pass
+        (numba-compiled _parse_rows, or a single regex scan over the bytes without numba or when
+        a number needs float()'s full conversion).
+        Returns an (N, 5) float64 array, or None when the block is not plain numeric CSV
+        (headers, single-value lines, garbage) so the caller falls back to parse_line.
+        """
+        blob = b'\n'.join(lines)
+        if _parse_rows_jit is not None:
+            out = np.empty((len(lines), len(CSV_HEADER_FIELDS)), dtype=np.float64)
+            rows = _parse_rows_jit(np.frombuffer(blob, dtype=np.uint8), out)
+            if rows != _PARSE_INEXACT:
+                return out[:rows] if rows > 0 else None
+
+        matches = _LINE_RE.findall(blob)
+        if not matches or len(matches) != sum(1 for ln in lines if ln.strip()):
+            return None
+        try:
+            return np.asarray(matches, dtype=np.float64)
+        except ValueError:
+            return None
+
     # ---------- I/O loop & plotting ----------
 
-    def update_plot(self):
-        if not self.serial:
+    def ingest_block(self, block, lines, monitor_out, csv_out):
+        """Push a parsed (N, 5) block into the plot buffer, monitor and CSV text chunks."""
+        if block.shape[0] == 0:
             return
 
-        # Read as many lines as available (cap to prevent UI starvation)
-        lines_processed = 0
-        max_lines_per_tick = 5000  # plenty of headroom at 1 kHz
-        while self.serial.in_waiting and lines_processed < max_lines_per_tick:
-            try:
-                raw = self.serial.readline()
-            except Exception:
-                break
-            if not raw:
-                break
-            line = raw.decode(errors='ignore').strip()
+        # Monitor keeps only the last max_monitor_lines, so only those get decoded
+        now_str = self._tick_clock
+        for raw in lines[-self.max_monitor_lines:]:
+            line = raw.decode('ascii', 'ignore').strip()
+            if line:
+                self.monitor_lines.append((now_str, line))
+                monitor_out.append((now_str, line))
+
+        t_us = block[:, 0]
+        if self.t0_us is None:
+            self.t0_us = int(t_us[0])
+        self.push_samples((t_us - self.t0_us) / 1e6, block[:, self._field_idx])
+
+        t, r, a, va, vs = block[-1].tolist()
+        self.last_fields = Sample(int(t), int(r), a, va, vs)
+        if self.csv_file:
+            # Whole block in a single C-level format call instead of one % per row
+            row_fmt = self._tick_iso.replace('%', '%%') + "," + _CSV_BLOCK_ROW_FMT
+            csv_out.append((row_fmt * block.shape[0]) % tuple(block.ravel().tolist()))
+
+    def ingest_lines(self, lines, monitor_out, csv_out):
+        """Per-line fallback path (headers, single-value streams, malformed blocks)."""
+        for raw in lines:
+            line = raw.decode('ascii', 'ignore').rstrip('\r').strip()
             if not line:
                 continue
 
             # Serial monitor rolling buffer
-            now_str = QDateTime.currentDateTime().toString("HH:mm:ss.zzz")
+            now_str = self._tick_clock
             self.monitor_lines.append((now_str, line))
-            if len(self.monitor_lines) > self.max_monitor_lines:
-                self.monitor_lines = self.monitor_lines[-self.max_monitor_lines:]
-            lines_processed += 1
+            monitor_out.append((now_str, line))
 
             parsed = self.parse_line(line)
             if parsed is None:
                 continue
 
             # If the device sends single numeric lines (fallback mode)
-            if "val" in parsed and "t_us" not in parsed:
+            if type(parsed) is float:
                 # In this mode we don't have t_us; use wall-clock relative time
                 if self.t0_us is None:
                     self.t0_us = int(time.monotonic() * 1e6)
                 t_sec = (int(time.monotonic() * 1e6) - self.t0_us) / 1e6
-                y_val = parsed["val"]
-                self.x_data.append(t_sec)
-                self.y_data.append(y_val)
-                self.last_fields = {"t_us": int(t_sec * 1e6), "raw": None, "avg": y_val, "v_adc": None, "v_sensor": None}
-                self.trim_buffers()
+                self.push_sample(t_sec, parsed)
+                self.last_fields = Sample(int(t_sec * 1e6), None, parsed, None, None)
                 continue
 
             # Normal CSV mode: we have t_us and the fields
-            t_us = parsed["t_us"]
+            t_us = parsed.t_us
             if self.t0_us is None:
                 self.t0_us = t_us
             t_sec = (t_us - self.t0_us) / 1e6
 
-            field = self.field_selector.currentText()
-            if field == "raw":
-                y_val = parsed["raw"]
-            elif field == "avg":
-                y_val = parsed["avg"]
-            elif field == "v_adc":
-                y_val = parsed["v_adc"]
-            else:  # v_sensor
-                y_val = parsed["v_sensor"]
-
-            self.x_data.append(t_sec)
-            self.y_data.append(y_val)
+            y_val = self._parsed_getter(parsed)
+            self.push_sample(t_sec, y_val)
             self.last_fields = parsed
 
-            # CSV logging (richer schema)
-            if self.csv_writer:
-                iso_now = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-                row = [iso_now] + [parsed.get(k, "") for k in CSV_HEADER_FIELDS]
-                try:
-                    self.csv_writer.writerow(row)
-                except Exception:
-                    pass
-
-        # Update the monitor text area (only when new lines arrived)
-        if lines_processed > 0:
-            self.refresh_monitor_display()
-
-        # Plot current window
-        if self.x_data:
+            # CSV logging (richer schema), written once per tick by update_plot
+            if self.csv_file:
+                csv_out.append(_CSV_ROW_FMT % ((self._tick_iso,) + parsed))
+
+    def update_plot(self):
+        if not self.reader:
+            return
+        if self.reader.error:
+            self.label_status.setText(f"Status: Serial error - {self.reader.error}")
+            return
+
+        # Collect what the reader thread received and split into complete lines;
+        # the trailing partial line is kept for the next tick.
+        while not self.reader.queue.empty():
+            self._rx_tail += self.reader.queue.get_nowait()
+        *lines, self._rx_tail = self._rx_tail.split(b'\n')
+        self._rx_tail = bytearray(self._rx_tail)
+
+        # Cap lines handled per tick to prevent UI starvation; the rest waits for the next tick
+        max_lines_per_tick = 5000  # plenty of headroom at 1 kHz
+        if len(lines) > max_lines_per_tick:
+            self._rx_tail[:0] = b'\n'.join(lines[max_lines_per_tick:]) + b'\n'
+            lines = lines[:max_lines_per_tick]
+
+        new_monitor_lines = []
+        csv_chunks = []
+        self._tick_clock, self._tick_iso = tick_timestamps()
+        block = self.parse_block(lines)
+        if block is not None:
+            self.ingest_block(block, lines, new_monitor_lines, csv_chunks)
+        else:
+            self.ingest_lines(lines, new_monitor_lines, csv_chunks)
+
+        if csv_chunks and self.csv_file:
+            try:
+                self.csv_file.write("".join(csv_chunks).encode('ascii'))
+                self._csv_ticks += 1
+                if self._csv_ticks >= self.csv_flush_every:
+                    self.csv_file.flush()
+                    self._csv_ticks = 0
+            except Exception:
+                pass
+
+        # Nobody is looking: data is buffered and logged above, skip all drawing until the window comes back
+        if self.isMinimized() or not self.isVisible():
+            if new_monitor_lines:
+                self._monitor_stale = True
+            return
+
+        # Append only the newly received lines to the monitor (one call per tick)
+        if new_monitor_lines:
+            self.append_monitor_lines(new_monitor_lines[-self.max_monitor_lines:])
+
+        # Plot current window, only when something changed and the plot can be seen
+        if self._dirty and self._tail > self._head and self.plot_widget.isVisible():
             self.trim_by_time_window()
-            self.plot_curve.setData(self.x_data, self.y_data)
+            xs, ys = self.window_arrays()
+            # ~2 points per horizontal pixel is all the widget can show
+            self.plot_curve.setData(*minmax_decimate(xs, ys, self.plot_widget.width() or 1000))
+            self.update_view_range(xs, ys)
             self.update_labels()
+            self._dirty = False
+
+    def push_sample(self, t_sec, y_val):
+        """Append one sample to the ring buffer, overwriting the oldest once the hard cap is hit."""
+        cap = self.max_points_cap
+        i = self._tail % cap
+        self._xbuf[i] = t_sec
+        self._ybuf[i] = y_val
+        self._tail += 1
+        if self._tail - self._head > cap:
+            self._head = self._tail - cap
+        self._window_cache = None
+        self._dirty = True
+
+    def push_samples(self, xs, ys):
+        """Append a batch of samples to the ring buffer with at most two slice copies."""
+        cap = self.max_points_cap
+        n = len(xs)
+        if n > cap:
+            self._tail += n - cap
+            xs, ys, n = xs[-cap:], ys[-cap:], cap
+        i = self._tail % cap
+        k = min(n, cap - i)
+        self._xbuf[i:i + k] = xs[:k]
+        self._ybuf[i:i + k] = ys[:k]
+        self._xbuf[:n - k] = xs[k:]
+        self._ybuf[:n - k] = ys[k:]
+        self._tail += n
+        if self._tail - self._head > cap:
+            self._head = self._tail - cap
+        self._window_cache = None
+        self._dirty = True
+
+    def window_arrays(self):
+        """Return (x, y) arrays of the buffered samples, oldest first.
+        Plain views when the data is contiguous; concatenated once (and cached) after a wrap-around.
+        """
+        if self._window_cache is None:
+            cap = self.max_points_cap
+            n = self._tail - self._head
+            h = self._head % cap
+            if h + n <= cap:
+                self._window_cache = (self._xbuf[h:h + n], self._ybuf[h:h + n])
+            else:
+                t = self._tail % cap
+                self._window_cache = (np.concatenate((self._xbuf[h:], self._xbuf[:t])),
+                                      np.concatenate((self._ybuf[h:], self._ybuf[:t])))
+        return self._window_cache
 
     def trim_by_time_window(self):
-        """Trim x/y lists to only include the last buffer_seconds worth of data, also cap max points."""
-        if not self.x_data:
+        """Drop samples older than buffer_seconds by advancing the ring head (no copying)."""
+        if self._tail == self._head:
             return
-        t_latest = self.x_data[-1]
+        cap = self.max_points_cap
+        t_latest = self._xbuf[(self._tail - 1) % cap]
         t_min = t_latest - float(self.buffer_seconds)
 
-        # Find first index >= t_min
-        # Linear scan is okay for modest sizes, but to be safe perform a while-pop from left.
-        # We keep lists; popping front is O(n). To avoid that, find start index and slice once.
-        start_idx = 0
-        # Binary search would be better, but pyqtgraph + 1 kHz with 10 min buffer is manageable.
-        for i in range(len(self.x_data)-1, -1, -1):
-            if self.x_data[i] < t_min:
-                start_idx = i + 1
-                break
-        if start_idx > 0:
-            self.x_data = self.x_data[start_idx:]
-            self.y_data = self.y_data[start_idx:]
-
-        # Hard cap
-        if len(self.x_data) > self.max_points_cap:
-            cut = len(self.x_data) - self.max_points_cap
-            self.x_data = self.x_data[cut:]
-            self.y_data = self.y_data[cut:]
-
-    def trim_buffers(self):
-        """Trim only by max cap (used in fallback mode without time window)"""
-        if len(self.x_data) > self.max_points_cap:
-            cut = len(self.x_data) - self.max_points_cap
-            self.x_data = self.x_data[cut:]
-            self.y_data = self.y_data[cut:]
+        # x is monotonic, so binary-search the (at most two) ring segments for the cut
+        n = self._tail - self._head
+        h = self._head % cap
+        first = self._xbuf[h:min(h + n, cap)]
+        drop = int(np.searchsorted(first, t_min, side='left'))
+        if drop == len(first) and h + n > cap:
+            drop += int(np.searchsorted(self._xbuf[:self._tail % cap], t_min, side='left'))
+        if drop:
+            self._head += drop
+            self._window_cache = None
+
+    def update_view_range(self, xs, ys):
+        """Follow the data with a manual range update every range_update_ms."""
+        now = time.monotonic()
+        if now - self._last_range_update < self.range_update_ms / 1000.0:
+            return
+        self._last_range_update = now
+        self.plot_widget.setXRange(float(xs[0]), float(xs[-1]), padding=0)
+        if self.auto_y_checkbox.isChecked():
+            self.plot_widget.setYRange(float(ys.min()), float(ys.max()))
 
     def update_labels(self):
         # Display the most recent value
-        if not self.y_data:
+        if self._tail == self._head:
             self.label_value.setText("Value: --")
             return
 
-        y = self.y_data[-1]
-        field = self.field_selector.currentText()
+        y = self._ybuf[(self._tail - 1) % self.max_points_cap]
+        field = self._field_key
         if field in ("raw", "avg"):
             self.label_value.setText(f"Value ({field}): {y:.2f}")
         else:
             # volts
             self.label_value.setText(f"Value ({field}): {y:.5f} V")
 
-        self.label_status.setText(f"Status: Running — points: {len(self.x_data)}")
+        self.label_status.setText(f"Status: Running — points: {self._tail - self._head}")
+
+    def format_monitor_lines(self, entries):
+        if self.timestamp_checkbox.isChecked():
+            return "\n".join(f"[{timestamp}] {line}" for timestamp, line in entries)
+        return "\n".join(line for _, line in entries)
 
-    def refresh_monitor_display(self):
+    def append_monitor_lines(self, entries):
+        self.serial_monitor.append(self.format_monitor_lines(entries))
+
+    def _full_rebuild_monitor(self):
+        """Redraw the whole monitor from monitor_lines (only needed when the timestamp toggle changes)."""
+        self._monitor_stale = False
         self.serial_monitor.clear()
-        show_time = self.timestamp_checkbox.isChecked()
-        # Only draw the last N lines kept in monitor_lines
-        for timestamp, line in self.monitor_lines:
-            if show_time:
-                display = f"[{timestamp}] {line}"
-            else:
-                display = line
-            self.serial_monitor.append(display)
+        if self.monitor_lines:
+            self.append_monitor_lines(self.monitor_lines)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            # Keep draining the port while minimized, just far less often
+            self.plot_timer.setInterval(200 if self.isMinimized() else 20)
+            if not self.isMinimized() and self._monitor_stale:
+                self._full_rebuild_monitor()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._monitor_stale:
+            self._full_rebuild_monitor()
 
     def closeEvent(self, event):
         self.stop_plotting()
@@ -427,6 +794,7 @@ class SerialPlotApp(QMainWindow):
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    warm_up_parser()
 
     # Slightly nicer default plot antialiasing
     pg.setConfigOptions(antialias=True)
@@ -1,15 +1,122 @@
 import sys
 import serial
 import serial.tools.list_ports
-import csv
+import os
+import queue
+import selectors
+import threading
 import time
+from collections import deque
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QLabel,
-    QVBoxLayout, QWidget, QHBoxLayout, QComboBox, QTextEdit,
+    QVBoxLayout, QWidget, QHBoxLayout, QComboBox, QPlainTextEdit,
     QCheckBox, QComboBox
 )
 import pyqtgraph as pg
-from PyQt5.QtCore import QTimer, QDateTime
+from PyQt5.QtCore import QTimer, QDateTime, QThread
+
+
+def tune_serial_port(ser):
+    """Best effort: low-latency delivery on Linux, a bigger driver RX buffer on Windows."""
+    if hasattr(ser, 'set_low_latency_mode'):   # Linux: ASYNC_LOW_LATENCY (1 ms FTDI latency timer)
+        try:
+            ser.set_low_latency_mode(True)
+        except (ValueError, OSError):
+            pass   # not every driver supports TIOCSSERIAL
+    if hasattr(ser, 'set_buffer_size'):        # Windows: SetupComm
+        try:
+            ser.set_buffer_size(rx_size=1 << 20, tx_size=1 << 16)
+        except (ValueError, OSError, serial.SerialException):
+            pass
+
+
+def parse_values(line):
+    """Parse a stripped 'v1,v2,...' line into a float64 array, skipping empty fields.
+    Returns None if any field is not a number.
+    """
+    # Blank fields only come from ',,', a leading/trailing ',' or whitespace; without them the
+    # whole line is one C call (np.fromstring would read a blank field as -1, so those take the slow path)
+    if ',,' not in line and line[:1] != ',' and line[-1:] != ',' and ' ' not in line and '\t' not in line:
+        fields = line.count(',') + 1 if line else 0
+    else:
+        parts = [v for v in line.split(',') if v.strip()]
+        line, fields = ','.join(parts), len(parts)
+    try:
+        values = np.fromstring(line, dtype=np.float64, sep=',')
+    except ValueError:
+        return None
+    # Older numpy returns the numbers read so far (with a DeprecationWarning) instead of raising
+    return values if values.size == fields else None
+
+
+class SerialReader(QThread):
+    """Reads the serial port on its own thread and hands raw chunks to the GUI through a queue."""
+
+    BUF_SIZE = 4096
+    BUF_COUNT = 8
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.serial = ser
+        self.queue = queue.SimpleQueue()
+        self.error = None
+        self._stop = threading.Event()
+        # POSIX: wait on the fd with a selector registered once (epoll on Linux) and
+        # scatter-read straight from it into a fixed pool of buffers
+        self._bufs = None
+        self._sel = None
+        if os.name == "posix":
+            self._bufs = [bytearray(self.BUF_SIZE) for _ in range(self.BUF_COUNT)]
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(ser.fileno(), selectors.EVENT_READ)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                if self._bufs:
+                    data = self._read_direct()
+                else:
+                    data = self._read_burst()
+            except Exception as e:
+                self.error = e
+                break
+            if data:
+                self.queue.put(data)
+        if self._sel:
+            self._sel.close()
+
+    def _read_burst(self):
+        """Block (up to the port timeout) until data arrives, then take everything else already waiting.
+        Topping up in the same call hands a whole burst to the queue instead of a lone first byte.
+        """
+        data = self.serial.read(self.serial.in_waiting or 1)
+        n = self.serial.in_waiting
+        if data and n:
+            data += self.serial.read(n)
+        return data
+
+    def _read_direct(self):
+        """Sleep until the fd is readable, then fill up to BUF_COUNT x BUF_SIZE bytes with one readv() call."""
+        if not self._sel.select(0.05):
+            return b''
+        fd = self.serial.fileno()
+        try:
+            n = os.readv(fd, self._bufs)
+        except BlockingIOError:
+            return b''
+        if n == 0:
+            raise serial.SerialException("device reports readiness to read but returned no data")
+        full, rem = divmod(n, self.BUF_SIZE)
+        parts = self._bufs[:full]
+        if rem:
+            parts.append(memoryview(self._bufs[full])[:rem])
+        return b''.join(parts)
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
+
 
 class SerialPlotApp(QMainWindow):
     def __init__(self):
@@ -18,12 +125,17 @@ class SerialPlotApp(QMainWindow):
         self.setGeometry(100, 100, 900, 700)
 
         self.serial = None
-        self.data = []
-        self.csv_writer = None
-        self.csv_file = None
-        self.max_data_points = 2500 # default 5 sec * 50Hz
-        self.monitor_lines = []  # stores (timestamp, line)
+        self.reader = None          # SerialReader thread feeding update_plot
+        self._rx_buf = bytearray()  # bytes received but not yet terminated by '\n'
+        self.log_fd = None          # raw fd of the CSV log; rows are batched in _wbuf
+        self._wbuf = bytearray()
+        self._WBUF_MAX = 1 << 16    # write to the fd once this much is pending
+        self.max_data_points = 2500 # default 5 sec * 500Hz
+        # Ring buffer of samples: y values, _head counts every sample ever pushed
+        self._y = np.empty(self.max_data_points, dtype=np.float32)
+        self._head = 0
         self.max_monitor_lines = 100
+        self.monitor_lines = deque(maxlen=self.max_monitor_lines)  # stores (timestamp, line)
 
         self.standby_mode = False
         self.standby_started = False
@@ -71,9 +183,11 @@ class SerialPlotApp(QMainWindow):
         self.timestamp_checkbox.stateChanged.connect(self.refresh_monitor_display)
 
         # Raw serial monitor
-        self.serial_monitor = QTextEdit()
+        self.serial_monitor = QPlainTextEdit()
         self.serial_monitor.setReadOnly(True)
         self.serial_monitor.setFixedHeight(150)
+        # Qt drops the oldest blocks itself, so new lines can simply be appended
+        self.serial_monitor.setMaximumBlockCount(self.max_monitor_lines)
 
         # Layout
         top_layout = QHBoxLayout()
@@ -121,6 +235,11 @@ class SerialPlotApp(QMainWindow):
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_ports)
         self.refresh_timer.start(2000)  # Refresh every 2 seconds
+
+        # CSV rows sit in _wbuf until it fills; push the remainder to disk about once a second
+        self.csv_flush_timer = QTimer()
+        self.csv_flush_timer.timeout.connect(self.flush_csv)
+        self.csv_flush_timer.start(1000)
         
         self.refresh_ports()
 
@@ -141,8 +260,14 @@ class SerialPlotApp(QMainWindow):
                 self.trigger_start = float(self.start_trigger_input.currentText())
                 self.trigger_stop = float(self.stop_trigger_input.currentText())
                 selected_port = self.port_selector.currentText()
-                self.serial = serial.Serial(selected_port, 115200, timeout=1)
-                self.data = []
+                self.close_port()   # never leave a previous reader running on the old port
+                # Short timeout so the reader thread notices a stop request quickly
+                self.serial = serial.Serial(selected_port, 115200, timeout=0.05)
+                tune_serial_port(self.serial)
+                self._rx_buf.clear()
+                self.reader = SerialReader(self.serial)
+                self.reader.start()
+                self._head = 0
                 self.plot_timer.start(1000 // 50)
             except ValueError:
                 print("Invalid trigger thresholds.")
@@ -158,16 +283,16 @@ class SerialPlotApp(QMainWindow):
         if self.start_button.isChecked():
             selected_port = self.port_selector.currentText()
             try:
-                self.serial = serial.Serial(selected_port, 115200, timeout=1)
-                self.data = []
+                self.close_port()   # never leave a previous reader running on the old port
+                # Short timeout so the reader thread notices a stop request quickly
+                self.serial = serial.Serial(selected_port, 115200, timeout=0.05)
+                tune_serial_port(self.serial)
+                self._rx_buf.clear()
+                self.reader = SerialReader(self.serial)
+                self.reader.start()
+                self._head = 0
                 if self.save_csv_checkbox.isChecked():
-                    # Prepare CSV log file
-                    timestamp = time.strftime("%Y%m%d-%H%M%S")
-                    self.csv_file = open(f"serial_log_{timestamp}.csv", 'w', newline='')
-                    self.csv_writer = csv.writer(self.csv_file)
-                    self.csv_writer.writerow(["Timestamp", "Value"])
-                else:
-                    self.csv_writer = None
+                    self.open_csv_log()
 
                 self.plot_timer.start(1000 // 50)
                 self.label_status.setText("Status: Running")
@@ -178,94 +303,132 @@ class SerialPlotApp(QMainWindow):
         else:
             self.stop_plotting()
 
-    def stop_plotting(self):
-        self.plot_timer.stop()
+    def close_port(self):
+        """Stop and join the reader thread, then close its port."""
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         if self.serial:
             self.serial.close()
             self.serial = None
-        if self.csv_file:
-            self.csv_file.close()
-            self.csv_file = None
+
+    def stop_plotting(self):
+        self.plot_timer.stop()
+        self.close_port()
+        if self.log_fd is not None:
+            self.flush_csv()
+            os.close(self.log_fd)
+            self.log_fd = None
         self.label_status.setText("Status: Stopped")
         self.start_button.setText("Start")
 
     
     def update_plot(self):
-        if not self.serial or not self.serial.in_waiting:
+        """Drain everything the reader thread received and handle every complete line in it."""
+        if not self.reader:
+            return
+        if self.reader.error:
+            self.label_status.setText(f"Status: Serial error - {self.reader.error}")
             return
 
-       
-        try:
-            line = self.serial.readline().decode("utf-8").strip()
+        while not self.reader.queue.empty():
+            self._rx_buf += self.reader.queue.get_nowait()
+        if self._rx_buf.find(b'\n') < 0:
+            return
+
+        # One clock read per tick, shared by every line drained in it
+        now = QDateTime.currentDateTime()
+        now_str = now.toString("HH:mm:ss.zzz")
+        timestamp = now.toString("yyyy-MM-dd HH:mm:ss.zzz")
+
+        new_monitor_lines = []
+        got_values = False
+        while True:
+            idx = self._rx_buf.find(b'\n')
+            if idx < 0:
+                break
+            raw_bytes = self._rx_buf[:idx]  # line without '\n'
+            del self._rx_buf[:idx+1]
+            line = raw_bytes.decode("utf-8", "ignore").strip()
 
             # Monitor update
-            now_str = QDateTime.currentDateTime().toString("HH:mm:ss.zzz")
             self.monitor_lines.append((now_str, line))
-            if len(self.monitor_lines) > self.max_monitor_lines:
-                self.monitor_lines = self.monitor_lines[-self.max_monitor_lines:]
-            self.refresh_monitor_display()
+            new_monitor_lines.append((now_str, line))
 
             # Parse and log values
-            values = [float(v) for v in line.split(",") if v.strip() != ""]
-
-             # Standby mode logic
+            values = parse_values(line)
+            if values is None:
+                self.label_status.setText("Status: Invalid data")
+                continue
+            if values.size == 0:
+                continue
+
+             # Standby mode logic (vectorized threshold checks over the whole line)
             if self.standby_mode:
-                for v in values:
-                    if not self.standby_started and v >= self.trigger_start:
+                first = 0   # values a stop can trigger on start after the start trigger
+                if not self.standby_started:
+                    hits = values >= self.trigger_start
+                    if hits.any():
                         print("Trigger START condition met.")
                         if self.save_csv_checkbox.isChecked():
-                            # Prepare CSV log file
-                            timestamp = time.strftime("%Y%m%d-%H%M%S")
-                            self.csv_file = open(f"serial_log_{timestamp}.csv", 'w', newline='')
-                            self.csv_writer = csv.writer(self.csv_file)
-                            self.csv_writer.writerow(["Timestamp", "Value"])
-                        else:
-                            self.csv_writer = None
+                            self.open_csv_log()
                         self.standby_started = True
-                    elif self.standby_started and v <= self.trigger_stop:
-                        print("Trigger STOP condition met.")
-                        self.standby_started = False
-                        self.standby_mode = False
-                        self.standby_button.setText("Standby")
-                        timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-                        for v in values:
-                            self.data.append((timestamp, v))
-                            if self.csv_writer:
-                                self.csv_writer.writerow([timestamp, v])
-
-                        if len(self.data) > self.max_data_points:
-                            self.data = self.data[-self.max_data_points:]
-
-                        values_only = [v for (_, v) in self.data]
-                        self.plot_widget.plot(values_only, clear=True)
-                        self.stop_plotting()
-                        return
+                        first = int(hits.argmax()) + 1
+                if self.standby_started and (values[first:] <= self.trigger_stop).any():
+                    print("Trigger STOP condition met.")
+                    self.standby_started = False
+                    self.standby_mode = False
+                    self.standby_button.setText("Standby")
+                    self.push_samples(values)
+                    self.log_values(timestamp, values)
+
+                    self.append_monitor_lines(new_monitor_lines[-self.max_monitor_lines:])
+                    self.plot_widget.plot(self.ring_view(self._y), clear=True)
+                    self.stop_plotting()
+                    return
 
             if not self.standby_mode or self.standby_started:
-                # Proceed with plotting and logging
-                timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-                for v in values:
-                    self.data.append((timestamp, v))
-                    if self.csv_writer:
-                        self.csv_writer.writerow([timestamp, v])
-
-                if len(self.data) > self.max_data_points:
-                    self.data = self.data[-self.max_data_points:]
-
-                values_only = [v for (_, v) in self.data]
-                self.plot_widget.plot(values_only, clear=True)
-
-        except Exception as e:
-            print(f"Serial read error: {e}")
-
-            self.label_value.setText(f"Value: {value:.2f}")
-
-            # Log to CSV with timestamp
-            #now = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-            if self.csv_writer:
-                self.csv_writer.writerow([now, value])
-        except ValueError:
-            self.label_status.setText("Status: Invalid data")
+                # Proceed with logging; the plot is redrawn once after the whole batch
+                self.push_samples(values)
+                self.log_values(timestamp, values)
+                got_values = True
+
+        # Append only the newly received lines to the monitor (one call per tick)
+        if new_monitor_lines:
+            self.append_monitor_lines(new_monitor_lines[-self.max_monitor_lines:])
+
+        if got_values:
+            ys = self.ring_view(self._y)
+            self.plot_widget.plot(ys, clear=True)
+            self.label_value.setText(f"Value: {ys[-1]:.2f}")
+
+    def open_csv_log(self):
+        """Create a new timestamped CSV log and queue its header."""
+        if self.log_fd is not None:
+            self.flush_csv()   # finish the previous log before replacing it
+            os.close(self.log_fd)
+            self.log_fd = None
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)   # like "w"; no newline translation on Windows
+        self.log_fd = os.open(f"serial_log_{timestamp}.csv", flags, 0o644)
+        self._wbuf.clear()
+        self._wbuf += b"Timestamp,Value\r\n"
+
+    def log_values(self, timestamp, values):
+        """Queue one 'timestamp,value' CSV row per value, all rows formatted by a single % call."""
+        if self.log_fd is not None and values.size:
+            # %r gives the same float text csv.writer used; rows keep its \r\n terminator
+            row = timestamp.replace('%', '%%') + ",%r\r\n"
+            self._wbuf += ((row * values.size) % tuple(values.tolist())).encode('ascii')
+            if len(self._wbuf) >= self._WBUF_MAX:
+                self.flush_csv()
+
+    def flush_csv(self):
+        if self.log_fd is not None and self._wbuf:
+            written = os.write(self.log_fd, self._wbuf)
+            while written < len(self._wbuf):   # short writes are rare on regular files
+                written += os.write(self.log_fd, self._wbuf[written:])
+            self._wbuf.clear()
 
     def update_buffer_size(self):
         duration_map = {
@@ -278,17 +441,49 @@ class SerialPlotApp(QMainWindow):
         }
         selected = self.duration_selector.currentText()
         seconds = duration_map.get(selected, 60)
-        self.max_data_points = seconds * 500  # 50 Hz
+        self.max_data_points = seconds * 500  # 500 Hz
+        self.resize_ring(self.max_data_points)
+
+    def push_samples(self, values):
+        """Write values into the ring buffer, overwriting the oldest once it is full."""
+        cap = self._y.shape[0]
+        n = len(values)
+        if n > cap:
+            self._head += n - cap
+            values = values[-cap:]
+            n = cap
+        i = self._head % cap
+        first = min(n, cap - i)
+        self._y[i:i + first] = values[:first]
+        self._y[:n - first] = values[first:]
+        self._head += n
+
+    def ring_view(self, buf):
+        """Samples of buf oldest-first: a view until the ring wraps, then one concatenated copy."""
+        cap = buf.shape[0]
+        if self._head <= cap:
+            return buf[:self._head]
+        i = self._head % cap
+        return np.concatenate((buf[i:], buf[:i]))
+
+    def resize_ring(self, capacity):
+        """Reallocate the ring buffer for a new capacity, keeping the most recent samples."""
+        y = self.ring_view(self._y)[-capacity:]
+        self._y = np.empty(capacity, dtype=np.float32)
+        self._y[:len(y)] = y
+        self._head = len(y)
+
+    def format_monitor_lines(self, entries):
+        if self.timestamp_checkbox.isChecked():
+            return "\n".join(f"[{timestamp}] {line}" for timestamp, line in entries)
+        return "\n".join(line for _, line in entries)
+
+    def append_monitor_lines(self, entries):
+        self.serial_monitor.appendPlainText(self.format_monitor_lines(entries))
 
     def refresh_monitor_display(self):
-        self.serial_monitor.clear()
-        show_time = self.timestamp_checkbox.isChecked()
-        for timestamp, line in self.monitor_lines:
-            if show_time:
-                display = f"[{timestamp}] {line}"
-            else:
-                display = line
-            self.serial_monitor.append(display)
+        """Redraw the whole monitor from monitor_lines (only needed when the timestamp toggle changes)."""
+        self.serial_monitor.setPlainText(self.format_monitor_lines(self.monitor_lines))
 
     def closeEvent(self, event):
         self.stop_plotting()
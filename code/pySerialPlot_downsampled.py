@@ -4,16 +4,32 @@
 # - Plots a decimated subset only (user controls "every N-th" + "max plot points")
 # - Logs EVERY incoming line to CSV (raw) with minimal overhead
 # - Optional "Pause plot" so logging continues without drawing
-# - Fast I/O: burst reads + line buffer; QPlainTextEdit monitor (throttled)
-# - Deque ring buffers + time-window trimming; two-timer loop
+# - Fast I/O: reader thread + line buffer; QPlainTextEdit monitor (throttled)
+# - NumPy ring buffer + time-window trimming; two-timer loop
 #
 # Deps: pip install pyqt5 pyqtgraph pyserial   (or use PyQt6)
+#       optional: pip install fastnumbers numba   (faster int/float parsing, compiled burst parser)
 
 import sys
 import serial
 import serial.tools.list_ports
+import os
+import queue
+import selectors
+import operator
+import threading
 import time
-from collections import deque
+import numpy as np
+
+try:
+    # Optional: C-level drop-in replacements for the int()/float() builtins
+    from fastnumbers import int as parse_int, float as parse_float
+except ImportError:
+    parse_int, parse_float = int, float
+try:
+    from numba import njit   # optional: compiles the burst parser below
+except ImportError:
+    njit = None
 
 # ---- Qt compatibility (PyQt6 preferred, fallback to PyQt5) ----
 PYQT_VER = 0
@@ -25,31 +41,190 @@ def _import_qt():
             QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
             QPlainTextEdit, QCheckBox, QSpinBox
         )
-        from PyQt6.QtCore import QTimer, QDateTime
+        from PyQt6.QtCore import QTimer, QDateTime, QThread, pyqtSignal
         PYQT_VER = 6
         return (QApplication, QMainWindow, QPushButton, QLabel,
                 QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
-                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime)
+                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime, QThread, pyqtSignal)
     except Exception:
         from PyQt5.QtWidgets import (
             QApplication, QMainWindow, QPushButton, QLabel,
             QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
             QPlainTextEdit, QCheckBox, QSpinBox
         )
-        from PyQt5.QtCore import QTimer, QDateTime
+        from PyQt5.QtCore import QTimer, QDateTime, QThread, pyqtSignal
         PYQT_VER = 5
         return (QApplication, QMainWindow, QPushButton, QLabel,
                 QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
-                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime)
+                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime, QThread, pyqtSignal)
 
 (QApplication, QMainWindow, QPushButton, QLabel,
  QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
- QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime) = _import_qt()
+ QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime, QThread, pyqtSignal) = _import_qt()
 
 import pyqtgraph as pg
 
 
 CSV_HEADER_FIELDS = ["t_us", "raw", "avg", "v_adc", "v_sensor"]
+# Column of a parsed int block and the divisor that turns it into display units
+FIELD_COLUMNS = {"raw": (1, 1.0), "avg": (2, 1000.0), "v_adc": (3, 1e6), "v_sensor": (4, 1e6)}
+# First characters a 't_us,raw,avg_mcounts,v_adc_uV,v_sensor_uV' data row can start with
+_ROW_START = frozenset("-0123456789")
+
+
+def _parse_int_rows(buf, out):
+    """Scan newline-separated 't_us,raw,avg_mcounts,v_adc_uV,v_sensor_uV' int rows
+    from a uint8 buffer into out (N, 5). Blank lines are skipped. Returns the number
+    of rows written, or -1 as soon as a line does not fit the format.
+    """
+    n = buf.shape[0]
+    ncols = out.shape[1]
+    row = 0
+    i = 0
+    while i < n:
+        c = buf[i]
+        if c == 10 or c == 13 or c == 32:   # blank line / CR / space
+            i += 1
+            continue
+        if row >= out.shape[0]:
+            return -1
+        col = 0
+        while True:
+            neg = False
+            if i < n and buf[i] == 45:   # '-'
+                neg = True
+                i += 1
+            val = 0
+            digits = 0
+            while i < n and 48 <= buf[i] <= 57:
+                val = val * 10 + (buf[i] - 48)
+                digits += 1
+                i += 1
+            if digits == 0:
+                return -1
+            out[row, col] = -val if neg else val
+            col += 1
+            if col == ncols:
+                break
+            if i >= n or buf[i] != 44:   # ','
+                return -1
+            i += 1
+        while i < n and (buf[i] == 13 or buf[i] == 32):
+            i += 1
+        if i < n and buf[i] != 10:
+            return -1
+        row += 1
+    return row
+
+
+# Native burst parser when numba is installed; otherwise parse_block uses np.fromstring
+# No on-disk cache in a frozen (pyinstaller) build: its directory is not writable
+_parse_int_rows_jit = njit(cache=not getattr(sys, "frozen", False))(_parse_int_rows) if njit is not None else None
+
+
+def warm_up_parser():
+    """Compile _parse_int_rows now (at startup) instead of on the GUI thread at the first burst."""
+    if _parse_int_rows_jit is not None:
+        _parse_int_rows_jit(np.frombuffer(b"0,0,0,0,0\n", dtype=np.uint8), np.empty((1, 5), dtype=np.int64))
+
+
+def tune_serial_port(ser):
+    """Best effort: low-latency delivery on Linux, a bigger driver RX buffer on Windows."""
+    if hasattr(ser, 'set_low_latency_mode'):   # Linux: ASYNC_LOW_LATENCY (1 ms FTDI latency timer)
+        try:
+            ser.set_low_latency_mode(True)
+        except (ValueError, OSError):
+            pass   # not every driver supports TIOCSSERIAL
+    if hasattr(ser, 'set_buffer_size'):        # Windows: SetupComm
+        try:
+            ser.set_buffer_size(rx_size=1 << 20, tx_size=1 << 16)
+        except (ValueError, OSError, serial.SerialException):
+            pass
+
+
+class SerialReader(QThread):
+    """Reads the serial port on its own thread and hands raw chunks to the GUI through a queue."""
+
+    BUF_SIZE = 4096
+    BUF_COUNT = 8
+
+    # Emitted when data lands in a drained queue, so the GUI wakes on data instead of polling
+    data_ready = pyqtSignal()
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.serial = ser
+        self.queue = queue.SimpleQueue()
+        self.error = None
+        self._stop = threading.Event()
+        self._pending = threading.Event()   # set while a data_ready is waiting to be handled
+        # POSIX: wait on the fd with a selector registered once (epoll on Linux) and
+        # scatter-read straight from it into a fixed pool of buffers
+        self._bufs = None
+        self._sel = None
+        if os.name == "posix":
+            self._bufs = [bytearray(self.BUF_SIZE) for _ in range(self.BUF_COUNT)]
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(ser.fileno(), selectors.EVENT_READ)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                if self._bufs:
+                    data = self._read_direct()
+                else:
+                    data = self._read_burst()
+            except Exception as e:
+                self.error = e
+                break
+            if data:
+                self.queue.put(data)
+                if not self._pending.is_set():
+                    self._pending.set()
+                    self.data_ready.emit()
+        if self._sel:
+            self._sel.close()
+
+    def _read_burst(self):
+        """Block (up to the port timeout) until data arrives, then take everything else already waiting.
+        Topping up in the same call hands a whole burst to the queue instead of a lone first byte.
+        """
+        data = self.serial.read(self.serial.in_waiting or 1)
+        n = self.serial.in_waiting
+        if data and n:
+            data += self.serial.read(n)
+        return data
+
+    def _read_direct(self):
+        """Sleep until the fd is readable, then fill up to BUF_COUNT x BUF_SIZE bytes with one readv() call."""
+        if not self._sel.select(0.05):
+            return b''
+        fd = self.serial.fileno()
+        try:
+            n = os.readv(fd, self._bufs)
+        except BlockingIOError:
+            return b''
+        if n == 0:
+            raise serial.SerialException("device reports readiness to read but returned no data")
+        full, rem = divmod(n, self.BUF_SIZE)
+        parts = self._bufs[:full]
+        if rem:
+            parts.append(memoryview(self._bufs[full])[:rem])
+        return b''.join(parts)
+
+    def drain(self):
+        """Return everything queued so far as one bytes object (b'' if nothing).
+        Re-arms data_ready first, so a chunk queued while draining still signals.
+        """
+        self._pending.clear()
+        chunks = []
+        while not self.queue.empty():
+            chunks.append(self.queue.get_nowait())
+        return b''.join(chunks)
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
 
 
 class SerialPlotApp(QMainWindow):
@@ -60,6 +235,7 @@ class SerialPlotApp(QMainWindow):
 
         # --- Runtime state ---
         self.serial = None
+        self.reader = None       # SerialReader thread feeding poll_serial
         self.log_file = None     # text file handle; we write raw lines as-is
         self.logging_enabled = False
 
@@ -75,8 +251,19 @@ class SerialPlotApp(QMainWindow):
         self.buffer_seconds = 10
         self.max_points_cap = 2_000_000
         self.t0_us = None
-        self.x = deque()   # seconds (t_us - t0)/1e6
-        self.y = deque()   # selected field
+        # Preallocated ring buffer; _head/_tail are absolute sample indices (slot = index % cap)
+        self._xbuf = np.empty(self.max_points_cap, np.float64)  # seconds (t_us - t0)/1e6
+        self._ybuf = np.empty(self.max_points_cap, np.float32)  # selected field
+        self._head = 0                  # oldest sample kept
+        self._tail = 0                  # one past the newest sample
+        self._window_cache = None       # contiguous (x, y) for plotting, rebuilt on change
+        self._dirty = False             # new samples since the last redraw
+        # Control values cached from their change signals (read once per line/frame otherwise)
+        self._field_key = "v_sensor"
+        self._field_get = operator.itemgetter("v_sensor")
+        self._field_col = FIELD_COLUMNS["v_sensor"]
+        self._ds = 10
+        self._maxp = 2000
 
         # --- Widgets ---
         self.plot_widget = pg.PlotWidget()
@@ -86,6 +273,7 @@ class SerialPlotApp(QMainWindow):
         self.plot_widget.setLabel('left', 'Value')
         self.curve = self.plot_widget.plot([], [], pen=pg.mkPen(width=2))
         self.plot_widget.setClipToView(True)
+        self.plot_widget.setDownsampling(auto=True, mode='peak')
         self.plot_widget.enableAutoRange(axis=pg.ViewBox.YAxis, enable=False)
         self.plot_widget.setYRange(0, 3.0)
 
@@ -105,6 +293,7 @@ class SerialPlotApp(QMainWindow):
 
         self.field_selector = QComboBox()
         self.field_selector.addItems(["v_sensor", "v_adc", "avg", "raw"])
+        self.field_selector.currentTextChanged.connect(self.on_field_changed)
 
         self.auto_y_checkbox = QCheckBox("Auto Y")
         self.auto_y_checkbox.setChecked(True)
@@ -119,11 +308,13 @@ class SerialPlotApp(QMainWindow):
         self.ds_spin = QSpinBox()
         self.ds_spin.setRange(1, 1000)
         self.ds_spin.setValue(10)
+        self.ds_spin.valueChanged.connect(self.on_ds_changed)
 
         self.maxpoints_label = QLabel("Max plot points:")
         self.maxpoints_spin = QSpinBox()
         self.maxpoints_spin.setRange(200, 200000)
         self.maxpoints_spin.setValue(2000)
+        self.maxpoints_spin.valueChanged.connect(self.on_maxpoints_changed)
 
         self.label_value = QLabel("Value: --")
         self.label_status = QLabel("Status: Waiting...")
@@ -177,7 +368,7 @@ class SerialPlotApp(QMainWindow):
         # Timers
         self.poll_timer = QTimer()
         self.poll_timer.timeout.connect(self.poll_serial)
-        self.poll_timer.start(5)   # 200 Hz polling
+        self.poll_timer.start(100)   # watchdog only; the reader's data_ready signal drives poll_serial
 
         self.ui_timer = QTimer()
         self.ui_timer.timeout.connect(self.update_ui)
@@ -215,9 +406,13 @@ class SerialPlotApp(QMainWindow):
                 baud = 115200
 
             try:
-                # Non-blocking read (timeout=0) keeps GUI responsive
-                self.serial = serial.Serial(port, baudrate=baud, timeout=0)
+                # Reads happen on the reader thread; a short timeout lets it notice a stop request quickly
+                self.serial = serial.Serial(port, baudrate=baud, timeout=0.05)
+                tune_serial_port(self.serial)
                 self.reset_session_state()
+                self.reader = SerialReader(self.serial)
+                self.reader.data_ready.connect(self.poll_serial)
+                self.reader.start()
 
                 if self.save_csv_checkbox.isChecked():
                     ts = time.strftime("%Y%m%d-%H%M%S")
@@ -237,6 +432,9 @@ class SerialPlotApp(QMainWindow):
             self.stop_plotting()
 
     def stop_plotting(self):
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         if self.serial:
             try:
                 self.serial.close()
@@ -261,21 +459,17 @@ class SerialPlotApp(QMainWindow):
         self._rx_buf.clear()
         self.monitor_new_lines.clear()
         self.serial_monitor.clear()
-        self.x.clear()
-        self.y.clear()
+        self._head = self._tail = 0
+        self._window_cache = None
+        self._dirty = False
         self.t0_us = None
         self.curve.setData([], [])
 
     # ---------- Parsing ----------
     def parse_line(self, s):
-        s = s.strip()
-        if not s:
-            return None
-        # Skip CSV header lines if you ever print one
-        if s.lower().startswith(("t_us", "t,", "time_us")):
-            return None
-
-        parts = s.split(',')
+        # No strip()/lower() copies up front: int()/float() accept surrounding whitespace
+        # (incl. '\r'), and header or blank lines simply fail to convert below.
+        parts = s.split(',', 5)   # extra columns stay unsplit in parts[5]
         if len(parts) >= 5:
             # Try OLD float format first: t_us, raw, avg, v_adc, v_sensor
             # try:
@@ -290,131 +484,249 @@ class SerialPlotApp(QMainWindow):
 
             # Try NEW int-only format: t_us, raw, avg_mcounts, v_adc_uV, v_sensor_uV
             try:
-                t_us = int(parts[0])
-                raw = int(parts[1])
-                avg_mcounts = int(parts[2])
-                v_adc_uV = int(parts[3])
-                v_sensor_uV = int(parts[4])
-
-                avg = avg_mcounts / 1000.0     # -> counts
-                v_adc = v_adc_uV / 1e6         # -> Volts
-                v_sensor = v_sensor_uV / 1e6   # -> Volts
-                return {"t_us": t_us, "raw": raw, "avg": avg, "v_adc": v_adc, "v_sensor": v_sensor}
-            except Exception:
-                return None
+                t_us, raw, avg_mcounts, v_adc_uV, v_sensor_uV = map(parse_int, parts[:5])
+            except ValueError:
+                return None   # header line or garbage
+
+            avg = avg_mcounts / 1000.0     # -> counts
+            v_adc = v_adc_uV / 1e6         # -> Volts
+            v_sensor = v_sensor_uV / 1e6   # -> Volts
+            return {"t_us": t_us, "raw": raw, "avg": avg, "v_adc": v_adc, "v_sensor": v_sensor}
 
         # Fallback: single numeric line
         try:
-            return {"val": float(s)}
-        except Exception:
+            return {"val": parse_float(s)}
+        except ValueError:
             return None
 
 
+    def parse_block(self, raw, lines):
+        """Parse a burst of int-only 5-field lines in one native pass (numba-compiled
+        _parse_int_rows over the raw bytes, or one np.fromstring call without numba).
+        Returns an (N, 5) int64 array, or None if any line doesn't fit.
+        """
+        if _parse_int_rows_jit is not None:
+            out = np.empty((len(lines), 5), dtype=np.int64)
+            rows = _parse_int_rows_jit(np.frombuffer(raw, dtype=np.uint8), out)
+            return out[:rows] if rows > 0 else None
+
+        if not lines or any(line.count(',') != 4 for line in lines):
+            return None
+        try:
+            arr = np.fromstring(','.join(lines), dtype=np.int64, sep=',')
+        except ValueError:
+            return None
+        if arr.size != 5 * len(lines):
+            return None
+        return arr.reshape(-1, 5)
+
+    def parse_rows_skipping_headers(self, lines):
+        """Block-parse a burst whose only odd lines are headers/blanks (lines that yield no sample).
+        Returns None when any other line carries a sample, so ingest_lines keeps the arrival order.
+        """
+        rows = [line for line in lines if line.count(',') == 4 and line[:1] in _ROW_START]
+        if not rows or len(rows) == len(lines):
+            return None
+        if any(self.parse_line(line) is not None for line in lines if line.count(',') != 4 or line[:1] not in _ROW_START):
+            return None
+        return self.parse_block('\n'.join(rows).encode(), rows)
+
     # ---------- I/O + UI ----------
     def poll_serial(self):
-        """Fast serial polling; burst reads + minimal per-line overhead."""
-        if not self.serial:
+        """Drain the reader thread's queue, then handle every complete line of the burst at once.
+        Runs when the reader signals new data (plus a slow watchdog timer).
+        """
+        if not self.reader:
+            return
+        if self.reader.error:
+            self.label_status.setText(f"Status: Serial error - {self.reader.error}")
             return
         try:
-            n = self.serial.in_waiting
-            if n:
-                chunk = self.serial.read(n)
-                self._rx_buf.extend(chunk)
-                # process complete lines
-                while True:
-                    idx = self._rx_buf.find(b'\n')
-                    if idx < 0:
-                        break
-                    raw_bytes = self._rx_buf[:idx]  # line without '\n'
-                    del self._rx_buf[:idx+1]
-
-                    # Log raw line exactly as received
-                    if self.logging_enabled and self.log_file is not None:
-                        try:
-                            self.log_file.write(raw_bytes.decode(errors='ignore') + '\n')
-                        except Exception:
-                            pass
-
-                    # Prepare for monitor + plot
-                    line = raw_bytes.decode(errors='ignore').rstrip('\r')
-                    now_str = QDateTime.currentDateTime().toString("HH:mm:ss.zzz")
-                    self.monitor_new_lines.append(f"[{now_str}] {line}")
-
-                    parsed = self.parse_line(line)
-                    if parsed is None:
-                        continue
-
-                    if "val" in parsed and "t_us" not in parsed:
-                        if self.t0_us is None:
-                            self.t0_us = int(time.monotonic() * 1e6)
-                        t_sec = (int(time.monotonic() * 1e6) - self.t0_us) / 1e6
-                        y_val = parsed["val"]
-                    else:
-                        t_us = parsed["t_us"]
-                        if self.t0_us is None:
-                            self.t0_us = t_us
-                        t_sec = (t_us - self.t0_us) / 1e6
-                        field = self.field_selector.currentText()
-                        if field == "raw":
-                            y_val = parsed["raw"]
-                        elif field == "avg":
-                            y_val = parsed["avg"]
-                        elif field == "v_adc":
-                            y_val = parsed["v_adc"]
-                        else:
-                            y_val = parsed["v_sensor"]
-
-                    self.x.append(t_sec)
-                    self.y.append(y_val)
-
-                    # Trim by time window
-                    t_min = t_sec - float(self.buffer_seconds)
-                    while self.x and self.x[0] < t_min:
-                        self.x.popleft(); self.y.popleft()
-
-                    # Hard cap
-                    if len(self.x) > self.max_points_cap:
-                        drop = len(self.x) - self.max_points_cap
-                        for _ in range(drop):
-                            self.x.popleft(); self.y.popleft()
+            chunk = self.reader.drain()
+            if not chunk:
+                return
+            self._rx_buf += chunk
+            idx = self._rx_buf.rfind(b'\n')
+            if idx < 0:
+                return
+            raw = bytes(self._rx_buf[:idx])
+            text = raw.decode(errors='ignore')
+            del self._rx_buf[:idx+1]
+
+            # Log raw lines exactly as received
+            if self.logging_enabled and self.log_file is not None:
+                try:
+                    self.log_file.write(text + '\n')
+                except Exception:
+                    pass
+
+            # Prepare for monitor + plot
+            lines = [line.rstrip('\r') for line in text.split('\n')]
+            now_str = QDateTime.currentDateTime().toString("HH:mm:ss.zzz")
+            self.monitor_new_lines.extend(f"[{now_str}] {line}" for line in lines)
+
+            block = self.parse_block(raw, lines)
+            if block is None:
+                block = self.parse_rows_skipping_headers(lines)
+            if block is not None:
+                self.ingest_block(block)
+            else:
+                self.ingest_lines(lines)
+            self.trim_buffers()
 
         except Exception as e:
             self.label_status.setText(f"Status: Serial error - {e}")
 
+    def ingest_block(self, block):
+        """Append an (N, 5) int block of t_us,raw,avg_mcounts,v_adc_uV,v_sensor_uV rows."""
+        t_us = block[:, 0]
+        if self.t0_us is None:
+            self.t0_us = int(t_us[0])
+        col, scale = self._field_col
+        self.push_samples((t_us - self.t0_us) / 1e6, block[:, col] / scale)
+
+    def ingest_lines(self, lines):
+        """Per-line path for bursts with headers, single values or malformed rows."""
+        get_field = self._field_get
+        for line in lines:
+            parsed = self.parse_line(line)
+            if parsed is None:
+                continue
+
+            if "val" in parsed and "t_us" not in parsed:
+                if self.t0_us is None:
+                    self.t0_us = int(time.monotonic() * 1e6)
+                t_sec = (int(time.monotonic() * 1e6) - self.t0_us) / 1e6
+                y_val = parsed["val"]
+            else:
+                t_us = parsed["t_us"]
+                if self.t0_us is None:
+                    self.t0_us = t_us
+                t_sec = (t_us - self.t0_us) / 1e6
+                y_val = get_field(parsed)
+
+            self.push_sample(t_sec, y_val)
+
+    def push_sample(self, t_sec, y_val):
+        """Append one sample to the ring buffer, overwriting the oldest once the hard cap is hit."""
+        cap = self.max_points_cap
+        i = self._tail % cap
+        self._xbuf[i] = t_sec
+        self._ybuf[i] = y_val
+        self._tail += 1
+        if self._tail - self._head > cap:
+            self._head = self._tail - cap
+        self._window_cache = None
+        self._dirty = True
+
+    def push_samples(self, xs, ys):
+        """Append a batch of samples to the ring buffer with at most two slice copies."""
+        cap = self.max_points_cap
+        n = len(xs)
+        if n > cap:
+            self._tail += n - cap
+            xs, ys, n = xs[-cap:], ys[-cap:], cap
+        i = self._tail % cap
+        k = min(n, cap - i)
+        self._xbuf[i:i + k] = xs[:k]
+        self._ybuf[i:i + k] = ys[:k]
+        self._xbuf[:n - k] = xs[k:]
+        self._ybuf[:n - k] = ys[k:]
+        self._tail += n
+        if self._tail - self._head > cap:
+            self._head = self._tail - cap
+        self._window_cache = None
+        self._dirty = True
+
+    def window_arrays(self):
+        """Return (x, y) arrays of the buffered samples, oldest first.
+        Plain views when the data is contiguous; concatenated once (and cached) after a wrap-around.
+        """
+        if self._window_cache is None:
+            cap = self.max_points_cap
+            n = self._tail - self._head
+            h = self._head % cap
+            if h + n <= cap:
+                self._window_cache = (self._xbuf[h:h + n], self._ybuf[h:h + n])
+            else:
+                t = self._tail % cap
+                self._window_cache = (np.concatenate((self._xbuf[h:], self._xbuf[:t])),
+                                      np.concatenate((self._ybuf[h:], self._ybuf[:t])))
+        return self._window_cache
+
+    def trim_buffers(self):
+        """Drop samples older than buffer_seconds by advancing the ring head (the hard cap is the ring size)."""
+        if self._tail == self._head:
+            return
+        cap = self.max_points_cap
+        t_min = self._xbuf[(self._tail - 1) % cap] - float(self.buffer_seconds)
+
+        # x is monotonic, so binary-search the (at most two) ring segments for the cut
+        n = self._tail - self._head
+        h = self._head % cap
+        first = self._xbuf[h:min(h + n, cap)]
+        drop = int(np.searchsorted(first, t_min, side='left'))
+        if drop == len(first) and h + n > cap:
+            drop += int(np.searchsorted(self._xbuf[:self._tail % cap], t_min, side='left'))
+        if drop:
+            self._head += drop
+            self._window_cache = None
+
+    def on_field_changed(self, field):
+        """Cache the selected field's getter and block column."""
+        if field not in FIELD_COLUMNS:
+            field = "v_sensor"
+        self._field_key = field
+        self._field_get = operator.itemgetter(field)
+        self._field_col = FIELD_COLUMNS[field]
+        self._dirty = True
+
+    def on_ds_changed(self, value):
+        """Cache the decimation factor and redraw on the next UI tick."""
+        self._ds = max(1, value)
+        self._dirty = True
+
+    def on_maxpoints_changed(self, value):
+        """Cache the point cap and redraw on the next UI tick."""
+        self._maxp = max(200, value)
+        self._dirty = True
+
     def update_ui(self):
         """Throttled UI updates: plot (decimated) + monitor append."""
-        # Plot decimated
-        if self.x and not self.pause_plot_checkbox.isChecked():
-            n = len(self.x)
-            ds = max(1, self.ds_spin.value())                  # user-decimation (every N-th)
-            maxp = max(200, self.maxpoints_spin.value())       # cap points drawn
+        # Plot decimated, only when new samples arrived since the last redraw
+        if self._dirty and self._tail > self._head and not self.pause_plot_checkbox.isChecked():
+            self._dirty = False
+            x, y = self.window_arrays()
+            n = len(x)
+            ds = self._ds                                      # user-decimation (every N-th)
+            maxp = self._maxp                                  # cap points drawn
             step = max(ds, n // maxp) if n > maxp else ds
 
-            xs = list(self.x)[::step]
-            ys = list(self.y)[::step]
-            self.curve.setData(xs, ys)
+            # Strided views of the ring; no per-frame list copies
+            self.curve.setData(x[::step], y[::step])
 
             # Status & value
-            y_last = self.y[-1]
-            field = self.field_selector.currentText()
+            y_last = y[-1]
+            field = self._field_key
             if field in ("raw", "avg"):
                 self.label_value.setText(f"Value ({field}): {y_last:.2f}")
             else:
                 self.label_value.setText(f"Value ({field}): {y_last:.5f} V")
 
-            sps = (len(self.x) - 1) / (self.x[-1] - self.x[0]) if len(self.x) > 1 and (self.x[-1] - self.x[0]) > 0 else 0.0
-            span = self.x[-1] - self.x[0] if len(self.x) > 1 else 0.0
+            span = float(x[-1] - x[0]) if n > 1 else 0.0
+            sps = (n - 1) / span if span > 0 else 0.0
             self.label_status.setText(
-                f"Status: Running — points: {len(self.x)} | rate: {sps:.0f} sps | span: {span:.2f}s | draw step: {step}"
+                f"Status: Running — points: {n} | rate: {sps:.0f} sps | span: {span:.2f}s | draw step: {step}"
             )
 
-        # Monitor append (throttled)
-        # now_ms = int(time.time() * 1000)
-        # if now_ms - self.monitor_last_update >= self.monitor_update_ms and self.monitor_new_lines:
-        #     self.serial_monitor.appendPlainText("\n".join(self.monitor_new_lines))
-        #     self.serial_monitor.verticalScrollBar().setValue(self.serial_monitor.verticalScrollBar().maximum())
-        #     self.monitor_new_lines.clear()
-        #     self.monitor_last_update = now_ms
+        # Monitor append (throttled, one coalesced append per update)
+        now_ms = int(time.time() * 1000)
+        if now_ms - self.monitor_last_update >= self.monitor_update_ms and self.monitor_new_lines:
+            # The widget keeps only setMaximumBlockCount lines, so older pending ones are never shown
+            self.serial_monitor.appendPlainText("\n".join(self.monitor_new_lines[-self.serial_monitor.maximumBlockCount():]))
+            self.serial_monitor.verticalScrollBar().setValue(self.serial_monitor.verticalScrollBar().maximum())
+            self.monitor_new_lines.clear()
+            self.monitor_last_update = now_ms
 
     def closeEvent(self, event):
         self.stop_plotting()
@@ -431,6 +743,7 @@ def app_exec(app):
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    warm_up_parser()
     pg.setConfigOptions(antialias=True)
     window = SerialPlotApp()
     window.show()
@@ -15,6 +15,8 @@ import serial
 import serial.tools.list_ports
 import time
 from collections import deque
+from itertools import islice
+import numpy as np
 
 # --- Sensor conversion constants (ABPDANT005PGAA5) ---
 FS_PSI   = 5.0   # full-scale pressure (psi)
@@ -417,8 +419,10 @@ class SerialPlotApp(QMainWindow):
             maxp = max(200, self.maxpoints_spin.value())       # cap points drawn
             step = max(ds, n // maxp) if n > maxp else ds
 
-            xs = list(self.x)[::step]
-            ys = list(self.y)[::step]
+            # Strided read straight off the deques: no full-length list copy, one preallocated array per axis
+            count = (n + step - 1) // step
+            xs = np.fromiter(islice(self.x, 0, None, step), dtype=np.float64, count=count)
+            ys = np.fromiter(islice(self.y, 0, None, step), dtype=np.float64, count=count)
             self.curve.setData(xs, ys)
 
             # Status & value
@@ -8,9 +8,14 @@
 #
 # Deps: pip install pyqt5 pyqtgraph pyserial   (or use PyQt6)
 
-import sys, time
-import serial, serial.tools.list_ports
+import sys, time, queue, threading
 from collections import deque
+import serial, serial.tools.list_ports
+import numpy as np
+try:
+    from numba import njit   # optional: compiles the block ingest kernel below
+except ImportError:
+    njit = None
 
 # --- Sensor conversion constants (ABPDANT005PGAA5) ---
 FS_PSI   = 5.0   # full-scale pressure (psi)
@@ -26,31 +31,187 @@ def _import_qt():
             QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
             QPlainTextEdit, QCheckBox, QSpinBox
         )
-        from PyQt6.QtCore import QTimer, QDateTime
+        from PyQt6.QtCore import QTimer, QThread
         PYQT_VER = 6
         return (QApplication, QMainWindow, QPushButton, QLabel,
                 QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
-                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime)
+                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QThread)
     except Exception:
         from PyQt5.QtWidgets import (
             QApplication, QMainWindow, QPushButton, QLabel,
             QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
             QPlainTextEdit, QCheckBox, QSpinBox
         )
-        from PyQt5.QtCore import QTimer, QDateTime
+        from PyQt5.QtCore import QTimer, QThread
         PYQT_VER = 5
         return (QApplication, QMainWindow, QPushButton, QLabel,
                 QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
-                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime)
+                QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QThread)
 
 (QApplication, QMainWindow, QPushButton, QLabel,
  QVBoxLayout, QWidget, QHBoxLayout, QComboBox,
- QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QDateTime) = _import_qt()
+ QPlainTextEdit, QCheckBox, QSpinBox, QTimer, QThread) = _import_qt()
 
 import pyqtgraph as pg
 
 
 CSV_HEADER_FIELDS = ["t_us", "raw", "avg", "v_adc", "v_sensor", "psi"]
+PROC_ROW_FMT = ",%d,%d,%.3f,%.6f,%.6f,%.4f\n"   # after the iso_time column
+FIELD_KEYS = ("psi", "v_sensor", "v_adc", "avg", "raw")   # field_selector order; index = field id
+AA_MAX_POINTS = 5000   # drawn points above which the curve is rendered without antialiasing
+POLL_MS, POLL_FAST_MS, POLL_IDLE_MS = 5, 2, 50   # queue drain interval: normal / backlog / idle
+POLL_IDLE_AFTER = 20   # consecutive empty polls before backing off to POLL_IDLE_MS
+
+
+def enable_opengl():
+    """Draw curves through pyqtgraph's OpenGL path when PyOpenGL is installed (QPainter otherwise)."""
+    try:
+        import OpenGL.GL  # noqa: F401
+    except ImportError:
+        return False
+    pg.setConfigOptions(useOpenGL=True, enableExperimental=True)
+    return True
+
+
+def m4_downsample(x, y, n_bins):
+    """M4 decimation: first, min, max and last sample of each of n_bins equal-width time bins.
+    Draws the same pixels as the full line at ~one bin per pixel column; x must be ascending.
+    Returns (xs, ys) with at most 4 * n_bins points (empty bins are dropped).
+    """
+    starts = np.unique(np.searchsorted(x, np.linspace(x[0], x[-1], n_bins + 1)[:-1], side='left'))
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1] = len(x) - 1
+    xs = np.empty(4 * len(starts), dtype=x.dtype)
+    ys = np.empty(4 * len(starts), dtype=y.dtype)
+    xs[0::4] = xs[1::4] = x[starts]
+    xs[2::4] = xs[3::4] = x[ends]
+    ys[0::4] = y[starts]
+    ys[1::4] = np.minimum.reduceat(y, starts)
+    ys[2::4] = np.maximum.reduceat(y, starts)
+    ys[3::4] = y[ends]
+    return xs, ys
+
+
+def _ingest_rows(t_us, raw, avg, v_adc, v_sensor, field_id, t0_us, xbuf, ybuf, tail):
+    """Append one parsed block to the x/y buffers at tail in a single pass (the caller makes room):
+    time offset, psi conversion and field selection per row. Returns the new tail index.
+    """
+    for i in range(t_us.shape[0]):
+        if field_id == 0:
+            y = min(FS_PSI, max(0.0, FS_PSI * ((v_sensor[i] / VS_VOLTS) - 0.10) / 0.80))
+        elif field_id == 1:
+            y = v_sensor[i]
+        elif field_id == 2:
+            y = v_adc[i]
+        elif field_id == 3:
+            y = avg[i]
+        else:
+            y = raw[i]
+        xbuf[tail] = (t_us[i] - t0_us) / 1e6
+        ybuf[tail] = y
+        tail += 1
+    return tail
+
+# Explicit signature: compiled once at import for the C-contiguous float64 columns parse_block hands over,
+# never lazily on the GUI thread. No fastmath: x/psi must round exactly like the NumPy path.
+# No on-disk cache in a frozen (pyinstaller) build.
+_INGEST_SIG = "int64(" + ", ".join(["float64[::1]"] * 5 + ["int64", "float64"] + ["float64[::1]"] * 2 + ["int64"]) + ")"
+_ingest_rows_jit = (njit(_INGEST_SIG, cache=not getattr(sys, "frozen", False))(_ingest_rows)
+                    if njit is not None else None)
+
+
+def psi_from_v_sensor(v_sensor):
+    # PSI conversion (ratiometric 10–90% of Vs), clamped to 0..FS in place (branch-free min/max)
+    psi = FS_PSI * ((v_sensor / VS_VOLTS) - 0.10) / 0.80
+    return np.clip(psi, 0.0, FS_PSI, out=psi)
+
+
+def tune_serial_port(ser):
+    """Best effort: low-latency delivery on Linux, a bigger driver RX buffer on Windows."""
+    if hasattr(ser, 'set_low_latency_mode'):   # Linux: ASYNC_LOW_LATENCY (1 ms FTDI latency timer)
+        try:
+            ser.set_low_latency_mode(True)
+        except (ValueError, OSError):
+            pass   # not every driver supports TIOCSSERIAL
+    if hasattr(ser, 'set_buffer_size'):        # Windows: SetupComm
+        try:
+            ser.set_buffer_size(rx_size=1 << 20, tx_size=1 << 16)
+        except (ValueError, OSError, serial.SerialException):
+            pass
+
+
+class SerialReader(QThread):
+    """Reads the serial port on its own thread and hands raw chunks to the GUI through a queue."""
+
+    READ_SIZE = 65536
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.serial = ser
+        self.queue = queue.SimpleQueue()
+        self.error = None
+        self._stop = threading.Event()
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                # One big read: returns what arrived within the port timeout, up to READ_SIZE bytes
+                data = self.serial.read(self.READ_SIZE)
+            except Exception as e:
+                self.error = e
+                break
+            if data:
+                self.queue.put(data)
+
+    def drain(self):
+        """Return everything queued so far as one bytes object (b'' if nothing)."""
+        chunks = []
+        while not self.queue.empty():
+            chunks.append(self.queue.get_nowait())
+        return b''.join(chunks)
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
+
+
+class LogWriter(threading.Thread):
+    """Writes queued chunks to a file on its own thread, so a slow disk never stalls the GUI."""
+
+    def __init__(self, f, maxsize=10000):
+        super().__init__(daemon=True)
+        self.file = f
+        self.queue = queue.Queue(maxsize=maxsize)   # bounded: a stuck disk drops chunks instead of eating RAM
+        self.dropped = 0      # chunks discarded because the queue was full
+        self.error = None     # last write/flush error, shown by the GUI
+        self._closing = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                data = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._closing.is_set():
+                    break
+                # Idle: push the file buffer out
+                try: self.file.flush()
+                except Exception as e: self.error = e
+                continue
+            try: self.file.write(data)
+            except Exception as e: self.error = e
+        try: self.file.close()
+        except Exception as e: self.error = e
+
+    def write(self, data):
+        # Called from the GUI thread: never blocks
+        try: self.queue.put_nowait(data)
+        except queue.Full: self.dropped += 1
+
+    def close(self, timeout=5.0):
+        # Let the queue drain, but don't hang the GUI on a stalled disk
+        self._closing.set()
+        self.join(timeout)
 
 
 class SerialPlotApp(QMainWindow):
@@ -61,8 +222,12 @@ class SerialPlotApp(QMainWindow):
 
         # --- Runtime state ---
         self.serial = None
-        self.raw_file = None         # raw lines as-is
+        self.reader = None           # SerialReader thread feeding poll_serial
+        self.raw_writer = None       # LogWriter thread for raw lines as-is
         self.proc_file = None        # processed CSV with units
+        self._proc_pending = []      # processed rows/blocks waiting for the next UI tick
+        self._sec_epoch = None       # wall-clock second whose "YYYY-MM-DD HH:MM:SS" is cached
+        self._sec_prefix = ""
         self.logging_raw = False
         self.logging_proc = False
 
@@ -72,14 +237,24 @@ class SerialPlotApp(QMainWindow):
         # Monitor (throttled)
         self.monitor_update_ms = 300
         self.monitor_last_update = 0
-        self.monitor_new_lines = []
+        self.monitor_max_lines = 300
+        # Pending lines, bounded at 2x what the monitor keeps: older ones would scroll out anyway
+        self.monitor_new_lines = deque(maxlen=2 * self.monitor_max_lines)
 
         # Data buffers
         self.buffer_seconds = 10
         self.max_points_cap = 2_000_000
         self.t0_us = None
-        self.x = deque()   # seconds
-        self.y = deque()   # selected field
+        self._int_format = False   # int-only CSV (mcounts/uV) seen this session
+        self._field_idx = 0        # field_selector index, cached from currentIndexChanged
+        self._field_key = FIELD_KEYS[0]
+        # Preallocated sliding buffer, twice the cap: the window [_head:_tail] is always contiguous,
+        # so plotting takes plain (strided) views; see _make_room
+        self._xbuf = np.empty(2 * self.max_points_cap, np.float64)   # seconds
+        self._ybuf = np.empty(2 * self.max_points_cap, np.float64)   # selected field
+        self._head = 0             # oldest sample kept
+        self._tail = 0             # one past the newest sample
+        self._plot_dirty = False   # new samples since the last redraw
 
         # --- Widgets ---
         self.plot_widget = pg.PlotWidget()
@@ -87,8 +262,9 @@ class SerialPlotApp(QMainWindow):
         self.plot_widget.showGrid(x=True, y=True, alpha=0.25)
         self.plot_widget.setLabel('bottom', 'Time', units='s')
         self.plot_widget.setLabel('left', 'Value')
-        self.curve = self.plot_widget.plot([], [], pen=pg.mkPen(width=2))
-        self.plot_widget.setClipToView(True)
+        # Bare PlotCurveItem: no PlotDataItem NaN scan/copies; samples are always finite (parsed numbers)
+        self.curve = pg.PlotCurveItem(pen=pg.mkPen(width=2), skipFiniteCheck=True, connect='all')
+        self.plot_widget.addItem(self.curve)
 
         self.port_selector = QComboBox()
         self.baud_selector = QComboBox()
@@ -105,7 +281,8 @@ class SerialPlotApp(QMainWindow):
         self.duration_selector.currentIndexChanged.connect(self.update_buffer_size)
 
         self.field_selector = QComboBox()
-        self.field_selector.addItems(["psi", "v_sensor", "v_adc", "avg", "raw"])
+        self.field_selector.addItems(list(FIELD_KEYS))
+        self.field_selector.currentIndexChanged.connect(self.on_field_changed)
         self.field_selector.currentIndexChanged.connect(self.update_y_axis)
 
         self.auto_y_checkbox = QCheckBox("Auto Y")
@@ -125,18 +302,14 @@ class SerialPlotApp(QMainWindow):
         self.ds_spin = QSpinBox()
         self.ds_spin.setRange(1, 1000)
         self.ds_spin.setValue(4)
-
-        self.maxpoints_label = QLabel("Max plot points:")
-        self.maxpoints_spin = QSpinBox()
-        self.maxpoints_spin.setRange(200, 200000)
-        self.maxpoints_spin.setValue(2000)
+        self.ds_spin.valueChanged.connect(self.mark_dirty)
 
         self.label_value = QLabel("Value: --")
         self.label_status = QLabel("Status: Waiting...")
 
         self.serial_monitor = QPlainTextEdit()
         self.serial_monitor.setReadOnly(True)
-        self.serial_monitor.setMaximumBlockCount(300)
+        self.serial_monitor.setMaximumBlockCount(self.monitor_max_lines)
         self.serial_monitor.setFixedHeight(160)
 
         # Layouts
@@ -158,8 +331,6 @@ class SerialPlotApp(QMainWindow):
         controls.addStretch(1)
         controls.addWidget(self.ds_label)
         controls.addWidget(self.ds_spin)
-        controls.addWidget(self.maxpoints_label)
-        controls.addWidget(self.maxpoints_spin)
         controls.addStretch(1)
         controls.addWidget(self.save_raw_checkbox)
         controls.addWidget(self.save_proc_checkbox)
@@ -182,8 +353,9 @@ class SerialPlotApp(QMainWindow):
         self.setCentralWidget(container)
 
         # Timers
-        self.poll_timer = QTimer(); self.poll_timer.timeout.connect(self.poll_serial); self.poll_timer.start(5)
-        self.ui_timer   = QTimer(); self.ui_timer.timeout.connect(self.update_ui);   self.ui_timer.start(50)
+        self._empty_polls = 0
+        self.poll_timer = QTimer(); self.poll_timer.timeout.connect(self.poll_serial); self.poll_timer.start(POLL_MS)
+        self.ui_timer   = QTimer(); self.ui_timer.timeout.connect(self.update_ui);   self.ui_timer.start(100)   # 10 Hz redraw
         self.refresh_timer = QTimer(); self.refresh_timer.timeout.connect(self.refresh_ports); self.refresh_timer.start(2000)
 
         self.refresh_ports()
@@ -212,16 +384,22 @@ class SerialPlotApp(QMainWindow):
             except ValueError:
                 baud = 115200
             try:
-                self.serial = serial.Serial(port, baudrate=baud, timeout=0)
+                # Reads happen on the reader thread; the short timeout bounds both latency and stop response
+                self.serial = serial.Serial(port, baudrate=baud, timeout=0.005)
+                tune_serial_port(self.serial)
                 self.reset_session_state()
+                self.reader = SerialReader(self.serial)
+                self.reader.start()
 
                 self.logging_raw  = self.save_raw_checkbox.isChecked()
                 self.logging_proc = self.save_proc_checkbox.isChecked()
                 ts = time.strftime("%Y%m%d-%H%M%S")
                 if self.logging_raw:
-                    self.raw_file = open(f"serial_raw_{ts}.csv", "a", buffering=1)
+                    self.raw_writer = LogWriter(open(f"serial_raw_{ts}.csv", "ab", buffering=1 << 20))
+                    self.raw_writer.start()
                 if self.logging_proc:
-                    self.proc_file = open(f"serial_proc_{ts}.csv", "a", buffering=1)
+                    # Block-buffered: rows are handed over once per UI tick (flush_proc)
+                    self.proc_file = open(f"serial_proc_{ts}.csv", "a", buffering=1 << 20)
                     self.proc_file.write("iso_time,t_us,raw,avg,v_adc,v_sensor,psi\n")
 
                 self.label_status.setText("Status: Running")
@@ -233,31 +411,42 @@ class SerialPlotApp(QMainWindow):
             self.stop_plotting()
 
     def stop_plotting(self):
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         if self.serial:
             try: self.serial.close()
             except: pass
             self.serial = None
-        if self.raw_file:
-            try: self.raw_file.close()
-            except: pass
-            self.raw_file = None
+        raw_problem = None
+        if self.raw_writer:
+            self.raw_writer.close()   # drains the queue (bounded wait), then closes the file
+            raw_problem = self.raw_log_problem()
+            self.raw_writer = None
         if self.proc_file:
+            self.flush_proc()
             try: self.proc_file.close()
             except: pass
             self.proc_file = None
-        self.label_status.setText("Status: Stopped")
+        self.label_status.setText(f"Status: Stopped — {raw_problem}" if raw_problem else "Status: Stopped")
         self.start_button.setText("Start")
 
     def update_buffer_size(self):
         m = {"5 sec":5,"10 sec":10,"30 sec":30,"1 min":60,"5 min":300,"10 min":600}
         self.buffer_seconds = m.get(self.duration_selector.currentText(), 10)
+        self.trim_buffers()   # a shorter window applies now, not on the next burst
 
     def reset_session_state(self):
         self._rx_buf.clear()
+        self._empty_polls = 0
+        self.poll_timer.setInterval(POLL_MS)
+        self._proc_pending.clear()
         self.monitor_new_lines.clear()
         self.serial_monitor.clear()
-        self.x.clear(); self.y.clear()
+        self._head = self._tail = 0
+        self._plot_dirty = False
         self.t0_us = None
+        self._int_format = False
         self.curve.setData([], [])
 
     def update_y_axis(self):
@@ -278,21 +467,22 @@ class SerialPlotApp(QMainWindow):
     # ---------- Parsing ----------
     @staticmethod
     def _is_intlike_big(s):
-        # True if no decimal and magnitude typical for microvolts (or large integers)
-        if '.' in s or 'e' in s or 'E' in s: return False
-        try:
-            return abs(int(s)) > 20000  # >20k => likely uV or mcounts
-        except: return False
+        # True for a plain integer bytes token with magnitude > 20000 (likely uV or mcounts); byte checks only, no int()
+        s = s.strip()
+        if s[:1] in (b'-', b'+'): s = s[1:]
+        s = s.lstrip(b'0')
+        return s.isdigit() and (len(s) > 5 or (len(s) == 5 and s > b"20000"))
 
     def parse_line(self, s):
         s = s.strip()
         if not s: return None
-        if s.lower().startswith(("t_us","t,","time_us")): return None
+        if s.lower().startswith((b"t_us", b"t,", b"time_us")): return None
 
-        parts = s.split(',')
+        parts = s.split(b',')
         if len(parts) >= 5:
-            # Heuristic: int-only format if v_adc & v_sensor look like big integers with no decimal
-            int_like = self._is_intlike_big(parts[3]) and self._is_intlike_big(parts[4])
+            # Heuristic: int-only format if v_adc & v_sensor look like big integers with no decimal;
+            # once seen, the session's format is known and the heuristic is skipped
+            int_like = self._int_format or (self._is_intlike_big(parts[3]) and self._is_intlike_big(parts[4]))
 
             if int_like:
                 # NEW int-only format
@@ -306,9 +496,10 @@ class SerialPlotApp(QMainWindow):
                     avg = avg_mcounts / 1000.0
                     v_adc = v_adc_uV / 1e6
                     v_sensor = v_sensor_uV / 1e6
+                    self._int_format = True
                 except Exception:
-                    return None
-            else:
+                    int_like = False   # not all integers: try the float format below
+            if not int_like:
                 # OLD float format
                 try:
                     t_us = int(parts[0])
@@ -319,11 +510,8 @@ class SerialPlotApp(QMainWindow):
                 except Exception:
                     return None
 
-            # PSI conversion (ratiometric 10–90% of Vs)
-            psi = FS_PSI * ((v_sensor / VS_VOLTS) - 0.10) / 0.80
-            # Only clamp softly to keep within 0..FS range
-            if psi < 0.0: psi = 0.0
-            if psi > FS_PSI: psi = FS_PSI
+            # PSI conversion (ratiometric 10–90% of Vs), clamped to 0..FS in one expression
+            psi = min(FS_PSI, max(0.0, FS_PSI * ((v_sensor / VS_VOLTS) - 0.10) / 0.80))
 
             return {"t_us": t_us, "raw": raw, "avg": avg, "v_adc": v_adc, "v_sensor": v_sensor, "psi": psi}
 
@@ -331,82 +519,248 @@ class SerialPlotApp(QMainWindow):
         try: return {"val": float(s)}
         except: return None
 
+    def parse_block(self, lines):
+        # Parse a burst of 5-field rows in one np.fromstring call -> (t_us, raw, avg, v_adc, v_sensor) arrays,
+        # or None if any line doesn't fit (header, single value, ambiguous format) so parse_line handles the burst
+        if not lines or any(line.count(b',') != 4 for line in lines):
+            return None
+        text = b','.join(lines)
+        try:
+            arr = np.fromstring(text, dtype=np.float64, sep=',')
+        except ValueError:
+            return None
+        if arr.size != 5 * len(lines):
+            return None
+        # nan/inf tokens take different int()/float() branches in parse_line; leave them to it
+        if not np.isfinite(arr).all():
+            return None
+        # copy(): one C-contiguous column per field, the only layout the compiled ingest accepts
+        t_us, raw, avg, v_adc, v_sensor = arr.reshape(-1, 5).T.copy()
+
+        # Same heuristic as parse_line, per row: int-only rows carry mcounts/uV (big integers)
+        int_like = (np.abs(v_adc) > 20000) & (np.abs(v_sensor) > 20000)
+        if b'.' in text or b'e' in text or b'E' in text:
+            # OLD float format; rows with big values (or an int-only session) need the per-token checks
+            if self._int_format or int_like.any():
+                return None
+            # parse_line reads t_us with int(): "123.0" or "1e5" is rejected there, so here too
+            heads = [line.split(b',', 1)[0] for line in lines]
+            if any(b'.' in h or b'e' in h or b'E' in h for h in heads):
+                return None
+            raw = np.trunc(raw)
+        elif self._int_format or int_like.any():
+            # NEW int-only format, from the first detected row on (as parse_line would see it)
+            if not self._int_format:
+                int_like[int(np.argmax(int_like)):] = True
+                self._int_format = True
+            else:
+                int_like[:] = True
+            avg      = np.where(int_like, avg / 1000.0, avg)
+            v_adc    = np.where(int_like, v_adc / 1e6, v_adc)
+            v_sensor = np.where(int_like, v_sensor / 1e6, v_sensor)
+        return t_us, raw, avg, v_adc, v_sensor
+
     # ---------- I/O + UI ----------
     def poll_serial(self):
-        if not self.serial: return
+        # Drain what the reader thread received since the last tick
+        if not self.reader or self.reader.error:
+            self.adapt_poll_interval(0)
+            if self.reader: self.label_status.setText(f"Status: Serial error - {self.reader.error}")
+            return
         try:
-            n = self.serial.in_waiting
-            if n:
-                chunk = self.serial.read(n)
+            chunk = self.reader.drain()
+            self.adapt_poll_interval(len(chunk))
+            if chunk:
                 self._rx_buf.extend(chunk)
-                while True:
-                    idx = self._rx_buf.find(b'\n')
-                    if idx < 0: break
-                    raw_bytes = self._rx_buf[:idx]; del self._rx_buf[:idx+1]
-
-                    # RAW logging first (exactly as received)
-                    if self.logging_raw and self.raw_file:
-                        try: self.raw_file.write(raw_bytes.decode(errors='ignore') + '\n')
-                        except: pass
-
-                    line = raw_bytes.decode(errors='ignore').rstrip('\r')
-                    # Light monitor
-                    now_str = QDateTime.currentDateTime().toString("HH:mm:ss.zzz")
-                    self.monitor_new_lines.append(f"[{now_str}] {line}")
-
-                    parsed = self.parse_line(line)
-                    if parsed is None: continue
-
-                    # Processed logging (converted units)
-                    if self.logging_proc and self.proc_file:
-                        try:
-                            iso_now = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss.zzz")
-                            row = f"{iso_now},{parsed['t_us']},{parsed['raw']},{parsed['avg']:.3f},{parsed['v_adc']:.6f},{parsed['v_sensor']:.6f},{parsed['psi']:.4f}\n"
-                            self.proc_file.write(row)
-                        except: pass
-
-                    # X/Y buffers
-                    if self.t0_us is None: self.t0_us = parsed['t_us']
-                    t_sec = (parsed['t_us'] - self.t0_us) / 1e6
-
-                    field = self.field_selector.currentText()
-                    if   field == "raw":      y_val = parsed["raw"]
-                    elif field == "avg":      y_val = parsed["avg"]
-                    elif field == "v_adc":    y_val = parsed["v_adc"]
-                    elif field == "v_sensor": y_val = parsed["v_sensor"]
-                    elif field == "psi":      y_val = parsed["psi"]
-                    else:                     y_val = parsed["v_sensor"]
-
-                    self.x.append(t_sec); self.y.append(y_val)
-
-                    # Trim by time window
-                    t_min = t_sec - float(self.buffer_seconds)
-                    while self.x and self.x[0] < t_min:
-                        self.x.popleft(); self.y.popleft()
-
-                    # Hard cap
-                    if len(self.x) > self.max_points_cap:
-                        drop = len(self.x) - self.max_points_cap
-                        for _ in range(drop): self.x.popleft(); self.y.popleft()
+                idx = self._rx_buf.rfind(b'\n')
+                if idx < 0: return
+                raw = bytes(self._rx_buf[:idx]); del self._rx_buf[:idx+1]
+
+                # RAW logging first (exactly as received, bytes straight to the "ab" file)
+                if self.logging_raw and self.raw_writer:
+                    self.raw_writer.write(raw + b'\n')
+
+                # Parsing works on bytes; only the monitor needs text
+                lines = [line.rstrip(b'\r') for line in raw.split(b'\n')]
+                # One wall-clock stamp for the whole burst
+                iso_now = self.iso_now()
+                # Light monitor: only the lines the bounded buffer keeps are decoded, none while hidden
+                if self.serial_monitor.isVisible() and not self.isMinimized():
+                    now_str = iso_now[11:]
+                    self.monitor_new_lines.extend(f"[{now_str}] {line.decode(errors='ignore')}"
+                                                  for line in lines[-self.monitor_new_lines.maxlen:])
+
+                # Whole burst as arrays; per-line fallback for headers/odd lines
+                cols = self.parse_block(lines)
+                if cols is not None:
+                    self.ingest_block(cols, iso_now)
+                else:
+                    self.ingest_lines(lines, iso_now)
+
+                # Trim by time window, once per read
+                self.trim_buffers()
 
         except Exception as e:
             self.label_status.setText(f"Status: Serial error - {e}")
 
+    def adapt_poll_interval(self, n_bytes):
+        # Back off while the port is idle; poll faster while the reader hands over full reads
+        if n_bytes:
+            self._empty_polls = 0
+            ms = POLL_FAST_MS if n_bytes >= SerialReader.READ_SIZE else POLL_MS
+        else:
+            self._empty_polls += 1
+            ms = POLL_IDLE_MS if self._empty_polls > POLL_IDLE_AFTER else POLL_MS
+        if self.poll_timer.interval() != ms:
+            self.poll_timer.setInterval(ms)
+
+    def iso_now(self):
+        # "YYYY-MM-DD HH:MM:SS.mmm" local time; strftime runs once per second, the rest is integer math
+        ns = time.time_ns()
+        sec = ns // 1_000_000_000
+        if sec != self._sec_epoch:
+            self._sec_prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._sec_epoch = sec
+        return f"{self._sec_prefix}.{(ns // 1_000_000) % 1000:03d}"
+
+    def ingest_block(self, cols, iso_now):
+        t_us, raw, avg, v_adc, v_sensor = cols
+
+        # Processed logging (converted units), one formatting call for the block
+        if self.logging_proc and self.proc_file:
+            try:
+                table = np.column_stack(cols + (psi_from_v_sensor(v_sensor),))
+                self._proc_pending.append(((iso_now + PROC_ROW_FMT) * len(t_us)) % tuple(table.ravel().tolist()))
+            except: pass
+
+        # X/Y buffers
+        if self.t0_us is None: self.t0_us = int(t_us[0])
+        field_id = self._field_idx
+        if _ingest_rows_jit is not None:
+            # Compiled single pass straight into the buffers
+            cap = self.max_points_cap
+            if len(t_us) > cap:
+                t_us, raw, avg, v_adc, v_sensor = (c[-cap:] for c in (t_us, raw, avg, v_adc, v_sensor))
+            self._make_room(len(t_us))
+            self._tail = _ingest_rows_jit(t_us, raw, avg, v_adc, v_sensor, field_id, float(self.t0_us),
+                                          self._xbuf, self._ybuf, self._tail)
+            self._head = max(self._head, self._tail - cap)
+            self._plot_dirty = True
+        else:
+            y = psi_from_v_sensor(v_sensor) if field_id == 0 else (v_sensor, v_sensor, v_adc, avg, raw)[field_id]
+            self.push_samples((t_us - self.t0_us) / 1e6, y)
+
+    def ingest_lines(self, lines, iso_now):
+        field_key = self._field_key
+        for line in lines:
+            parsed = self.parse_line(line)
+            # Skip unparsable lines and bare numbers (no t_us), without dropping the rest of the burst
+            if parsed is None or 't_us' not in parsed: continue
+
+            # Processed logging (converted units)
+            if self.logging_proc and self.proc_file:
+                try:
+                    row = f"{iso_now},{parsed['t_us']},{parsed['raw']},{parsed['avg']:.3f},{parsed['v_adc']:.6f},{parsed['v_sensor']:.6f},{parsed['psi']:.4f}\n"
+                    self._proc_pending.append(row)
+                except: pass
+
+            # X/Y buffers
+            if self.t0_us is None: self.t0_us = parsed['t_us']
+            t_sec = (parsed['t_us'] - self.t0_us) / 1e6
+
+            # Buffer append; past the hard cap the oldest sample is dropped
+            self.push_sample(t_sec, parsed[field_key])
+
+    # ---------- Sample buffer ----------
+    def _make_room(self, n):
+        # Slide the newest samples to the front when n more would run past the end of the buffer.
+        # The buffer is twice the cap, so this copies at most cap samples once per >= cap appends.
+        if self._tail + n > len(self._xbuf):
+            keep = min(self._tail - self._head, max(0, self.max_points_cap - n))
+            src = self._tail - keep
+            self._xbuf[:keep] = self._xbuf[src:self._tail]
+            self._ybuf[:keep] = self._ybuf[src:self._tail]
+            self._head, self._tail = 0, keep
+
+    def push_sample(self, t_sec, y_val):
+        self._make_room(1)
+        self._xbuf[self._tail] = t_sec; self._ybuf[self._tail] = y_val
+        self._tail += 1
+        self._head = max(self._head, self._tail - self.max_points_cap)
+        self._plot_dirty = True
+
+    def push_samples(self, xs, ys):
+        # Batch append with one slice copy per axis
+        cap = self.max_points_cap
+        if len(xs) > cap:
+            xs, ys = xs[-cap:], ys[-cap:]
+        n = len(xs)
+        self._make_room(n)
+        self._xbuf[self._tail:self._tail + n] = xs; self._ybuf[self._tail:self._tail + n] = ys
+        self._tail += n
+        self._head = max(self._head, self._tail - cap)
+        self._plot_dirty = True
+
+    def window_arrays(self):
+        # (x, y) oldest first, as views of the buffers; callers stride them (x[::step]) without copying
+        return self._xbuf[self._head:self._tail], self._ybuf[self._head:self._tail]
+
+    def trim_buffers(self):
+        # Drop samples older than buffer_seconds by binary-searching the window and advancing the head
+        if self._tail == self._head: return
+        t_min = self._xbuf[self._tail - 1] - float(self.buffer_seconds)
+        if self._xbuf[self._head] >= t_min: return   # still filling the window: nothing to drop
+        self._head += int(np.searchsorted(self._xbuf[self._head:self._tail], t_min, side='left'))
+        self._plot_dirty = True
+
+    def flush_proc(self):
+        # One writelines() per UI tick instead of a write (and line-buffered flush) per row
+        if self._proc_pending and self.proc_file:
+            try: self.proc_file.writelines(self._proc_pending)
+            except: pass
+        self._proc_pending.clear()
+
+    def on_field_changed(self, idx):
+        # Cache the selected field as an index into FIELD_KEYS (v_sensor if the combo is cleared)
+        self._field_idx = idx if 0 <= idx < len(FIELD_KEYS) else 1
+        self._field_key = FIELD_KEYS[self._field_idx]
+        self._plot_dirty = True
+
+    def raw_log_problem(self):
+        # Human-readable raw-log error / drop count, or None
+        w = self.raw_writer
+        if not w or (w.error is None and not w.dropped): return None
+        if w.error is not None:
+            return f"Raw log error - {w.error}"
+        return f"Raw log behind, dropped {w.dropped} chunks"
+
+    def mark_dirty(self, *_):
+        # Force a redraw on the next UI tick (decimation changed)
+        self._plot_dirty = True
+
     def update_ui(self):
-        # Plot (decimated draw) + status + monitor
-        if self.x and not self.pause_plot_checkbox.isChecked():
-            n = len(self.x)
+        # Processed CSV + plot (decimated draw) + status + monitor
+        self.flush_proc()
+
+        # Plot only when samples arrived since the last redraw
+        if self._plot_dirty and self._tail > self._head and not self.pause_plot_checkbox.isChecked():
+            self._plot_dirty = False
+            x, y = self.window_arrays()
+            n = len(x)
             ds = max(1, self.ds_spin.value())
-            maxp = max(200, self.maxpoints_spin.value())
-            step = max(ds, n // maxp) if n > maxp else ds
+            bins = max(100, self.plot_widget.width())   # ~one M4 bin per pixel column
 
-            xs = list(self.x)[::step]
-            ys = list(self.y)[::step]
-            self.curve.setData(xs, ys)
+            if n > 4 * bins * ds:
+                # More points than pixels: M4 keeps every peak with at most 4 points per bin
+                xs, ys = m4_downsample(x, y, bins)
+            else:
+                # Strided views of the ring; no per-frame list copies
+                xs, ys = x[::ds], y[::ds]
+            self.curve.setData(xs, ys, antialias=len(xs) <= AA_MAX_POINTS)
 
             # Labels
-            y_last = self.y[-1]
-            field = self.field_selector.currentText()
+            y_last = y[-1]
+            field = self._field_key
             if field in ("raw","avg"):
                 self.label_value.setText(f"Value ({field}): {y_last:.2f}")
             elif field == "psi":
@@ -414,9 +768,14 @@ class SerialPlotApp(QMainWindow):
             else:
                 self.label_value.setText(f"Value ({field}): {y_last:.5f} V")
 
-            sps = (len(self.x) - 1) / (self.x[-1] - self.x[0]) if len(self.x) > 1 and (self.x[-1] - self.x[0]) > 0 else 0.0
-            span = self.x[-1] - self.x[0] if len(self.x) > 1 else 0.0
-            self.label_status.setText(f"Status: Running — points: {len(self.x)} | rate: {sps:.0f} sps | span: {span:.2f}s | draw step: {step}")
+            span = float(x[-1] - x[0]) if n > 1 else 0.0
+            sps = (n - 1) / span if span > 0 else 0.0
+            self.label_status.setText(f"Status: Running — points: {n} | rate: {sps:.0f} sps | span: {span:.2f}s | drawn: {len(xs)}")
+
+        # Raw log trouble (disk full, stalled disk) overrides the running status
+        raw_problem = self.raw_log_problem()
+        if raw_problem:
+            self.label_status.setText(f"Status: {raw_problem}")
 
         # Monitor (throttled)
         now_ms = int(time.time() * 1000)
@@ -436,8 +795,8 @@ def app_exec(app):
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    # For absolute max draw speed:
-    # pg.setConfigOptions(antialias=False)
+    # GPU line rasterisation when available; antialiasing is dropped per frame for long curves (AA_MAX_POINTS)
+    enable_opengl()
     pg.setConfigOptions(antialias=True)
     window = SerialPlotApp()
     window.show()